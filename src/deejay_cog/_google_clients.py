@@ -0,0 +1,45 @@
+"""
+A thread pool whose workers each hold their own GoogleAPI client.
+
+The httplib2 transport behind a GoogleAPI client is not thread-safe, so
+concurrent reads cannot share the caller's client. Flows that fan reads out
+open one ClientPool for the whole run; each worker builds a client with the
+factory the flow used for its own client, once, and reuses it for every task
+the pool hands it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ClientPool:
+    """Run ``fn(client, item)`` calls concurrently with per-thread clients."""
+
+    def __init__(self, factory: Callable[[], Any], max_workers: int = 8) -> None:
+        self._factory = factory
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self) -> ClientPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._executor.shutdown(wait=True)
+
+    def client(self) -> Any:
+        """Return the calling thread's client, building it on first use."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._factory()
+        return client
+
+    def map(self, fn: Callable[[Any, T], R], items: Iterable[T]) -> Iterator[R]:
+        """Like ``Executor.map``: results come back in ``items`` order."""
+        return self._executor.map(lambda item: fn(self.client(), item), items)
@@ -0,0 +1,44 @@
+"""
+Helpers for calling the raw Sheets v4 client (``g.sheets.service``) directly.
+
+The GoogleAPI facade reads and writes one range per HTTP request. Flows that
+touch many tabs use these helpers to batch those calls into a single
+``values.batchGet`` instead.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Retries googleapiclient makes on 429/5xx responses, with exponential backoff,
+# for raw client calls (.execute(num_retries=API_RETRIES)); the facade's own
+# retry handling does not cover them.
+API_RETRIES = 5
+
+
+def sheet_range(sheet_name: str, cells: str) -> str:
+    """Return an A1 range for a tab, quoting the title so spaces/quotes are safe."""
+    escaped = sheet_name.replace("'", "''")
+    return f"'{escaped}'!{cells}"
+
+
+def batch_get_values(
+    values_api: Any,
+    spreadsheet_id: str,
+    sheet_names: list[str],
+    cells: str = "A:Z",
+) -> list[list[list[Any]]]:
+    """Read ``cells`` from every named tab in one ``values.batchGet`` call.
+
+    ``values_api`` is ``service.spreadsheets().values()``. Returns one row list
+    per tab, in the order of ``sheet_names`` (empty for a tab with no values).
+    """
+    if not sheet_names:
+        return []
+    response = values_api.batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=[sheet_range(name, cells) for name in sheet_names],
+        majorDimension="ROWS",
+    ).execute(num_retries=API_RETRIES)
+    value_ranges = response.get("valueRanges", [])
+    return [value_range.get("values", []) for value_range in value_ranges]
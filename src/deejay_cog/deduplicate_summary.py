@@ -1,12 +1,39 @@
 import argparse
+import concurrent.futures
+import functools
+import math
+import re
 import sys
+import unicodedata
 from typing import Any
 
 from mini_app_polis import logger as logger_mod
 from mini_app_polis.google import GoogleAPI
 
+from deejay_cog._sheets import API_RETRIES, batch_get_values, sheet_range
+
 log = logger_mod.get_logger()
 
+# NBSP and control whitespace folded to plain spaces in one translate pass.
+_WS_TRANS = str.maketrans({"\u00a0": " ", "\t": " ", "\r": " ", "\n": " "})
+
+# Joins identity key parts into one string key. Normalized parts never contain
+# it: U+001F counts as whitespace and is collapsed by _normalize_key_text.
+_KEY_SEP = "\x1f"
+
+# Runs of any Unicode whitespace; matches the same characters as str.split().
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+# Well-formed track lengths: M:SS or H:MM:SS (digits only, no spaces).
+_LENGTH_RE = re.compile(r"(?:(\d+):)?(\d+):(\d+)")
+
+# Runs of characters that are not str.isalnum(): \W plus the underscore \w allows.
+_NON_ALNUM_RUN = re.compile(r"[\W_]+")
+
+# Bound once: _normalize_key_cell runs for every key cell of every row.
+_unicode_category = unicodedata.category
+_unicode_normalize = unicodedata.normalize
+
 
 def deduplicate_summary(spreadsheet_id: str, g: GoogleAPI | None = None) -> None:
     """TODO: describe this function."""
@@ -19,13 +46,23 @@ def deduplicate_summary(spreadsheet_id: str, g: GoogleAPI | None = None) -> None
     )
     sheets = spreadsheet.get("sheets", [])
 
-    for sheet in sheets:
+    # Read every tab in one values.batchGet.
+    values_api = g.sheets.service.spreadsheets().values()
+    tab_values = batch_get_values(
+        values_api, spreadsheet_id, [s["properties"]["title"] for s in sheets]
+    )
+
+    # Every tab's output is accumulated here and written in a single
+    # values.batchUpdate at the end of the run (one write request instead of
+    # a clear + write per tab).
+    write_data: list[dict[str, Any]] = []
+
+    for sheet, data in zip(sheets, tab_values, strict=True):
         sheet_props = sheet["properties"]
         sheet_id = sheet_props["sheetId"]
         sheet_name = sheet_props["title"]
         log.debug(f"Processing sheet '{sheet_name}' (ID: {sheet_id})")
 
-        data = g.sheets.read_values(spreadsheet_id, f"{sheet_name}!A:Z")
         if not data or len(data) < 2:
             log.warning(f"⚠️ Skipping empty or header-only sheet: {sheet_name}")
             continue
@@ -33,34 +70,47 @@ def deduplicate_summary(spreadsheet_id: str, g: GoogleAPI | None = None) -> None
         header = [_strip_cell_value(h) for h in data[0]]
         rows = data[1:]
 
+        # Normalize the header once; every column lookup below is a dict hit.
+        header_index = _header_index(header)
+
         # Ensure 'Count' column exists (case-insensitive)
-        count_index = _find_column_index_ci(header, "Count")
-        if count_index is None:
+        count_index = header_index.get(_COL_COUNT)
+        add_count = count_index is None
+        # Width of the columns the sheet actually has; a new Count goes after.
+        h = len(header)
+        if add_count:
             header.append("Count")
-            rows = [row + ["1"] for row in rows]
-            count_index = len(header) - 1
+            count_index = h
 
-        title_index = _find_column_index_ci(header, "Title")
+        title_index = header_index.get(_COL_TITLE)
 
-        # Normalize row lengths
+        # Normalize row lengths (and append the default Count) in one pass
+        pad = [""] * h
         for i, row in enumerate(rows):
-            if len(row) < len(header):
-                row = row + [""] * (len(header) - len(row))
-            elif len(row) > len(header):
-                row = row[: len(header)]
-
             # Always strip leading/trailing whitespace on ALL cells to avoid whitespace-only duplicates.
-            row = [_strip_cell_value(v) for v in row]
+            # Sheets returns plain str cells, so only NBSP/non-str cells take the slow path.
+            # The stripped list is the row's only copy; padding then extends it in
+            # place (the API response rows are left untouched).
+            row = [
+                v.strip()
+                if v.__class__ is str and "\u00a0" not in v
+                else _strip_cell_value(v)
+                for v in (row if len(row) <= h else row[:h])
+            ]
+            if len(row) < h:
+                row.extend(pad[: h - len(row)])
+            if add_count:
+                row.append("1")
             rows[i] = row
 
         # Build a non-adjacent dedup map keyed by row values (excluding Count).
-        length_index = _find_column_index_ci(header, "Length")
+        length_index = header_index.get(_COL_LENGTH)
         # Placeholder for future BPM normalization if desired (not applied for now).
-        bpm_index = _find_column_index_ci(header, "BPM")
+        bpm_index = header_index.get(_COL_BPM)
 
-        comment_index = _find_column_index_ci(header, "Comment")
-        genre_index = _find_column_index_ci(header, "Genre")
-        year_index = _find_column_index_ci(header, "Year")
+        comment_index = header_index.get(_COL_COMMENT)
+        genre_index = header_index.get(_COL_GENRE)
+        year_index = header_index.get(_COL_YEAR)
 
         optional_indices = [
             i
@@ -72,108 +122,176 @@ def deduplicate_summary(spreadsheet_id: str, g: GoogleAPI | None = None) -> None
         # Within each identity key, merge rows when optional columns are compatible:
         # - empty vs non-empty is allowed (and we fill template with the non-empty value)
         # - non-empty vs different non-empty is NOT allowed
-        identity_to_entries: dict[tuple[str, ...], list[dict[str, Any]]] = {}
-
-        def _norm_optional(
-            col_i: int,
-            cell: Any,
-            *,
-            _len_idx: int | None = length_index,
-            _bpm_idx: int | None = bpm_index,
-        ) -> str:
-            s = _normalize_key_cell(cell)
-            if not s:
-                return ""
-            if _len_idx is not None and col_i == _len_idx:
-                return _normalize_length(s)
-            if _bpm_idx is not None and col_i == _bpm_idx:
-                return _normalize_bpm(s)
-            return s
+        identity_to_entries: dict[str, list[dict[str, Any]]] = {}
+        # Secondary index over every entry, keyed by (identity key, the entry's
+        # normalized optional values). Distinct entries under one identity always
+        # conflict on some non-empty optional value, so a row with every optional
+        # value filled is compatible with at most one entry: one whose values each
+        # equal the row's or are empty. Probing those combinations finds the same
+        # entry the linear scan would.
+        opt_entries: dict[tuple[str, tuple[str, ...]], dict[str, Any]] = {}
+
+        # Identity columns are the same for every row of the sheet: everything
+        # except Count and the optional match columns.
+        optional_set = set(optional_indices)
+        identity_cols = [
+            i for i in range(len(header)) if i != count_index and i not in optional_set
+        ]
 
-        for row in rows:
-            try:
-                row_count = int(_strip_cell_value(row[count_index]))
-            except Exception:
-                row_count = 0
-
-            identity_parts: list[str] = []
-            for col_i, cell in enumerate(row):
-                if col_i == count_index:
-                    continue
-                if col_i in optional_indices:
-                    continue
-                norm = _normalize_key_cell(cell)
-                if title_index is not None and col_i == title_index:
-                    # For title key comparison only: remove all non-alphanumeric characters, including whitespace
-                    norm = "".join(ch for ch in norm if ch.isalnum())
-                identity_parts.append(norm.lower())
-
-            identity_key = tuple(identity_parts)
-
-            # Compute normalized optional values for compatibility checks
-            opt_norm: dict[int, str] = {
-                i: _norm_optional(i, row[i]) for i in optional_indices
-            }
-
-            entries = identity_to_entries.setdefault(identity_key, [])
-
-            matched_entry = None
-            for entry in entries:
-                entry_opt: dict[int, str] = entry["opt_norm"]
-                compatible = True
-                for i in optional_indices:
-                    a = entry_opt.get(i, "")
-                    b = opt_norm.get(i, "")
-                    if a and b and a != b:
-                        compatible = False
-                        break
-                if compatible:
-                    matched_entry = entry
-                    break
-
-            if matched_entry is None:
-                # New distinct entry under this identity
-                template_row = row.copy()
-                # Ensure Count cell is string
-                template_row[count_index] = str(row_count)
-                entries.append(
-                    {
+        # Pick each column's key function once per sheet so the row loops make
+        # one call per cell instead of branching on the column index.
+        identity_parts = [
+            (i, _title_key_part if i == title_index else _identity_key_part)
+            for i in identity_cols
+        ]
+        optional_parts = [
+            (
+                i,
+                _normalize_length
+                if i == length_index
+                else _normalize_bpm
+                if i == bpm_index
+                else _normalize_key_cell,
+            )
+            for i in optional_indices
+        ]
+
+        # Positions to blank for each partial-match probe of a fully filled row.
+        blank_masks = [
+            [bool(m >> j & 1) for j in range(len(optional_indices))]
+            for m in range(1, 1 << len(optional_indices))
+        ]
+
+        if not optional_indices:
+            # Fast path: with no optional match columns every identity key maps
+            # to exactly one entry, so each row is a single dict lookup.
+            for row in rows:
+                row_count = _parse_count(row[count_index])
+                identity_key = _KEY_SEP.join(key(row[i]) for i, key in identity_parts)
+                entries = identity_to_entries.get(identity_key)
+                if entries is None:
+                    row[count_index] = str(row_count)
+                    identity_to_entries[identity_key] = [
+                        {"row": row, "count": row_count}
+                    ]
+                else:
+                    entry = entries[0]
+                    entry["count"] += row_count
+                    entry["row"][count_index] = str(entry["count"])
+        else:
+            for row in rows:
+                row_count = _parse_count(row[count_index])
+
+                identity_key = _KEY_SEP.join(key(row[i]) for i, key in identity_parts)
+
+                # Compute normalized optional values for compatibility checks
+                # (one value per optional_indices position).
+                opt_key = tuple(norm(row[i]) for i, norm in optional_parts)
+                opt_full = all(opt_key)
+
+                entries = identity_to_entries.setdefault(identity_key, [])
+
+                matched_entry = (
+                    opt_entries.get((identity_key, opt_key)) if opt_full else None
+                )
+                if matched_entry is None and entries:
+                    if opt_full and len(entries) > len(blank_masks):
+                        # Crowded key: probing the partially blanked combinations
+                        # is cheaper than scanning every entry.
+                        for mask in blank_masks:
+                            probe = tuple(
+                                "" if blank else v
+                                for v, blank in zip(opt_key, mask, strict=True)
+                            )
+                            matched_entry = opt_entries.get((identity_key, probe))
+                            if matched_entry is not None:
+                                break
+                    else:
+                        # Scan: entries with empty optional values can be
+                        # compatible with more than one incoming combination.
+                        for entry in entries:
+                            compatible = True
+                            for a, b in zip(entry["opt_norm"], opt_key, strict=True):
+                                if a and b and a != b:
+                                    compatible = False
+                                    break
+                            if compatible:
+                                matched_entry = entry
+                                break
+
+                if matched_entry is None:
+                    # New distinct entry under this identity. Rows were rebuilt as
+                    # fresh lists during length normalization and nothing else holds
+                    # them, so the entry can take the row itself instead of a copy.
+                    template_row = row
+                    # Ensure Count cell is string
+                    template_row[count_index] = str(row_count)
+                    new_entry = {
                         "row": template_row,
                         "count": row_count,
-                        "opt_norm": opt_norm,
+                        "opt_norm": opt_key,
                     }
-                )
-            else:
-                # Merge into the matched entry
-                matched_entry["count"] += row_count
-                matched_entry["row"][count_index] = str(matched_entry["count"])
-
-                # Fill missing optional values from incoming row (preserve original text)
-                for i in optional_indices:
-                    existing_norm = matched_entry["opt_norm"].get(i, "")
-                    incoming_norm = opt_norm.get(i, "")
-                    if not existing_norm and incoming_norm:
-                        matched_entry["opt_norm"][i] = incoming_norm
-                        if i < len(matched_entry["row"]) and i < len(row):
-                            matched_entry["row"][i] = row[i]
-
-        deduped_rows: list[list[str]] = []
+                    entries.append(new_entry)
+                    opt_entries[(identity_key, opt_key)] = new_entry
+                else:
+                    # Merge into the matched entry
+                    matched_entry["count"] += row_count
+                    matched_entry["row"][count_index] = str(matched_entry["count"])
+
+                    # Fill missing optional values from incoming row (preserve original text)
+                    old_key = matched_entry["opt_norm"]
+                    merged: list[str] | None = None
+                    for k, i in enumerate(optional_indices):
+                        if not old_key[k] and opt_key[k]:
+                            if merged is None:
+                                merged = list(old_key)
+                            merged[k] = opt_key[k]
+                            if i < len(matched_entry["row"]) and i < len(row):
+                                matched_entry["row"][i] = row[i]
+
+                    # Re-key the entry under its filled-in optional values.
+                    if merged is not None:
+                        merged_key = tuple(merged)
+                        matched_entry["opt_norm"] = merged_key
+                        del opt_entries[(identity_key, old_key)]
+                        opt_entries[(identity_key, merged_key)] = matched_entry
+
+        # The output starts with the header; every row after it is an entry's
+        # template row, which nothing else references, so padding can extend
+        # the rows in place.
+        final_data: list[list[str]] = [header]
         total_count_sum = 0
-        for _, entries in identity_to_entries.items():
+        for entries in identity_to_entries.values():
             for entry in entries:
-                deduped_rows.append(entry["row"])
+                final_data.append(entry["row"])
                 total_count_sum += entry["count"]
 
         log.debug(
-            f"Sheet '{sheet_name}': original rows={len(rows)}, deduplicated rows={len(deduped_rows)}, total count={total_count_sum}"
+            f"Sheet '{sheet_name}': original rows={len(rows)}, deduplicated rows={len(final_data) - 1}, total count={total_count_sum}"
         )
 
-        final_data = [header] + deduped_rows
-        g.sheets.clear(spreadsheet_id, f"{sheet_name}!A:Z")
-        g.sheets.write_values(
-            spreadsheet_id, f"{sheet_name}!A1", final_data, value_input_option="RAW"
+        # Deduped output never has more rows than the input, so instead of
+        # clearing the tab we pad the output with blank cells over the original
+        # footprint; stale trailing rows/columns are overwritten by the write.
+        # Every output row is exactly as wide as the header.
+        width = max(len(r) for r in data)
+        if width > len(header):
+            extra = [""] * (width - len(header))
+            for r in final_data:
+                r.extend(extra)
+        else:
+            width = len(header)
+        final_data.extend([[""] * width for _ in range(len(data) - len(final_data))])
+        write_data.append(
+            {"range": sheet_range(sheet_name, "A1"), "values": final_data}
         )
 
+    if write_data:
+        values_api.batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={"valueInputOption": "RAW", "data": write_data},
+        ).execute(num_retries=API_RETRIES)
+
     log.info(f"✅ Applying formatting for spreadsheet: {spreadsheet_id}")
     try:
         fmt.apply_formatting_to_sheet(spreadsheet_id)
@@ -182,14 +300,40 @@ def deduplicate_summary(spreadsheet_id: str, g: GoogleAPI | None = None) -> None
     log.info(f"✅ Finished deduplicate_summary for spreadsheet: {spreadsheet_id}")
 
 
-def _find_column_index_ci(header: list[str], target: str) -> int | None:
+def _column_key(name: str) -> str:
+    """Case-insensitive, normalized form used to match header names."""
+    return _normalize_key_cell(name).lower()
+
+
+def _header_index(header: list[str]) -> dict[str, int]:
+    """Map each normalized header name to its first column index."""
+    index: dict[str, int] = {}
     for i, h in enumerate(header):
-        if _normalize_key_cell(h).lower() == _normalize_key_cell(target).lower():
-            return i
-    return None
+        index.setdefault(_column_key(h), i)
+    return index
+
+
+# The key-part helpers are cached per cell text: artists/titles repeat across
+# rows, so each distinct value is lowered once and every row reuses the same
+# key string object instead of allocating a fresh copy.
+@functools.lru_cache(maxsize=65536)
+def _identity_key_part(cell: str) -> str:
+    return _normalize_key_cell(cell).lower()
+
+
+@functools.lru_cache(maxsize=65536)
+def _title_key_part(cell: str) -> str:
+    # For title key comparison only: remove all non-alphanumeric characters, including whitespace
+    return _NON_ALNUM_RUN.sub("", _normalize_key_cell(cell)).lower()
 
 
 def _normalize_key_cell(value: Any) -> str:
+    """Normalize cell text for deduplication key comparisons (see `_normalize_key_text`)."""
+    return _normalize_key_text("" if value is None else str(value))
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalize_key_text(s: str) -> str:
     """Normalize cell text for deduplication key comparisons.
 
     Accented characters are folded to their base letters (e.g., 'Beyoncé' == 'Beyonce').
@@ -199,34 +343,43 @@ def _normalize_key_cell(value: Any) -> str:
     normalizes unicode width/compat forms, and collapses whitespace.
 
     NOTE: We only apply this to the *key*, not to the stored template row.
-    """
-    s = "" if value is None else str(value)
 
+    Memoized: the same artist/title strings recur across rows and tabs.
+    """
     # Normalize non-breaking spaces and common whitespace to plain spaces
-    s = s.replace("\u00a0", " ")  # NBSP
-    s = s.replace("\t", " ").replace("\r", " ").replace("\n", " ")
+    s = s.translate(_WS_TRANS)
+
+    # Decompose so accents become combining marks (e.g. "é" -> "e" + "́"),
+    # then drop combining marks (Mn) and invisible/format characters (Cf,
+    # e.g. \u200b, \ufeff) in a single pass before re-composing.
+    s = "".join(
+        ch
+        for ch in _unicode_normalize("NFKD", s)
+        if (c := _unicode_category(ch)) != "Mn" and c != "Cf"
+    )
 
-    try:
-        import unicodedata
+    # Re-compose to a stable form
+    s = _unicode_normalize("NFKC", s)
 
-        # First decompose characters so accents become combining marks
-        # e.g. "é" -> "e" + "́"
-        s = unicodedata.normalize("NFKD", s)
+    # Collapse runs of whitespace and trim
+    return _WHITESPACE_RUN.sub(" ", s).strip()
 
-        # Remove combining marks (accents/diacritics)
-        s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
 
-        # Re-compose to a stable form
-        s = unicodedata.normalize("NFKC", s)
+# Header names the dedup looks up, pre-normalized once at import.
+_COL_COUNT = _column_key("Count")
+_COL_TITLE = _column_key("Title")
+_COL_LENGTH = _column_key("Length")
+_COL_BPM = _column_key("BPM")
+_COL_COMMENT = _column_key("Comment")
+_COL_GENRE = _column_key("Genre")
+_COL_YEAR = _column_key("Year")
 
-        # Remove invisible/format characters (category Cf), e.g. \u200b, \ufeff
-        s = "".join(ch for ch in s if unicodedata.category(ch) != "Cf")
-    except Exception:
-        pass
 
-    # Collapse runs of whitespace and trim
-    s = " ".join(s.split())
-    return s
+def _parse_count(value: Any) -> int:
+    try:
+        return int(_strip_cell_value(value))
+    except Exception:
+        return 0
 
 
 def _strip_cell_value(value: Any) -> str:
@@ -236,6 +389,11 @@ def _strip_cell_value(value: Any) -> str:
     We keep internal whitespace intact; we only remove leading/trailing whitespace and convert
     NBSP to a normal space first.
     """
+    if value.__class__ is str:
+        # Fast path: most cells are plain ASCII str with no NBSP to replace.
+        if "\u00a0" not in value:
+            return value.strip()
+        return value.replace("\u00a0", " ").strip()  # NBSP → space
     if value is None:
         return ""
     s = str(value)
@@ -251,11 +409,29 @@ def _normalize_length(value: str) -> str:
     """
     if value is None:
         return ""
+    return _normalize_length_from_key(_normalize_key_cell(value))
 
-    s = _normalize_key_cell(value)
+
+@functools.lru_cache(maxsize=65536)
+def _normalize_length_from_key(s: str) -> str:
+    """`_normalize_length` for text that is already key-normalized."""
     if not s:
         return ""
 
+    # Fast path for the usual well-formed M:SS / H:MM:SS text; anything else
+    # (inner spaces, empty segments, signs) takes the general parse below.
+    m = _LENGTH_RE.fullmatch(s)
+    if m is not None:
+        hh_raw, mm_raw, ss_raw = m.groups()
+        h = int(hh_raw) if hh_raw else 0
+        mins = int(mm_raw)
+        sec = int(ss_raw)
+        if sec >= 60 or mins >= 60:
+            return s
+        if h == 0:
+            return f"{mins}:{sec:02d}"
+        return f"{h}:{mins:02d}:{sec:02d}"
+
     parts = [p.strip() for p in s.split(":") if p.strip() != ""]
 
     # Accept common formats:
@@ -294,7 +470,7 @@ def _normalize_length(value: str) -> str:
     return f"{h}:{m:02d}:{sec:02d}"
 
 
-def _normalize_bpm(value: Any) -> str:
+def _normalize_bpm(value: str) -> str:
     """Normalize BPM values for deduplication key comparisons.
 
     Treats numeric equivalents as equal (e.g., '100' == '100.0').
@@ -302,7 +478,12 @@ def _normalize_bpm(value: Any) -> str:
 
     NOTE: This is key-only; we do not mutate what gets written back.
     """
-    s = _normalize_key_cell(value)
+    return _normalize_bpm_from_key(_normalize_key_cell(value))
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalize_bpm_from_key(s: str) -> str:
+    """`_normalize_bpm` for text that is already key-normalized."""
     if not s:
         return ""
 
@@ -312,14 +493,17 @@ def _normalize_bpm(value: Any) -> str:
     except Exception:
         return s
 
-    # If it's effectively an integer, drop the .0
+    # 'nan'/'inf' stay as text; round() cannot take them.
+    if not math.isfinite(f):
+        return s
+
+    # Effectively whole BPMs (within 1e-9) drop the fraction: 100.0 -> '100'.
     if abs(f - round(f)) < 1e-9:
-        return str(int(round(f)))
+        return str(round(f))
 
-    # Otherwise keep a stable string form (trim trailing zeros)
-    # e.g. 100.50 -> '100.5'
-    out = f"{f:f}".rstrip("0").rstrip(".")
-    return out
+    # Otherwise match to 6 decimal places, trailing zeros trimmed:
+    # 100.50 -> '100.5'.
+    return f"{f:.6f}".rstrip("0").rstrip(".")
 
 
 def _parse_args(argv: list[str]) -> argparse.Namespace:
@@ -343,10 +527,20 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
 if __name__ == "__main__":
     args = _parse_args(sys.argv[1:])
     exit_code = 0
-    for ss_id in args.spreadsheet_ids:
-        try:
-            deduplicate_summary(ss_id)
-        except Exception as e:
-            log.error(f"❌ Dedup failed for spreadsheet {ss_id}: {e}")
-            exit_code = 1
+    # Spreadsheets are independent and each call builds its own GoogleAPI
+    # client, so run them concurrently to overlap the Sheets round-trips.
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(8, len(args.spreadsheet_ids))
+    ) as executor:
+        futures = {
+            executor.submit(deduplicate_summary, ss_id): ss_id
+            for ss_id in args.spreadsheet_ids
+        }
+        for future in concurrent.futures.as_completed(futures):
+            ss_id = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                log.error(f"❌ Dedup failed for spreadsheet {ss_id}: {e}")
+                exit_code = 1
     raise SystemExit(exit_code)
@@ -12,20 +12,32 @@ The failure hook fires and logs locally, but the production_only=False
 flag passed to the pipeline_eval helpers prevents any API call.
 """
 
+from functools import lru_cache, partial
+from operator import itemgetter
+
 from mini_app_polis import logger as logger_mod
 from mini_app_polis.google import GoogleAPI
 from prefect import flow
 
 import deejay_cog.config as config
 import deejay_cog.deduplicate_summary as deduplication
+from deejay_cog._google_clients import ClientPool
 from deejay_cog._pipeline_eval import (
     get_prefect_logger,
     make_failure_hook,
     post_run_finding,
 )
+from deejay_cog._sheets import batch_get_values
 
 log = logger_mod.get_logger()
 
+# Worker threads reading source spreadsheets (see ClientPool).
+_READ_WORKERS = 8
+
+# One source tab: canonical kept headers, their column indices in the raw
+# rows, and the raw non-blank rows.
+_TabData = tuple[list[str], list[int], list[list[str]]]
+
 
 @flow(
     name="generate-summaries",
@@ -56,69 +68,76 @@ def generate_summaries_flow() -> None:
 
     logger.debug(f"Year folders found: {[f.name for f in year_folders]}")
 
+    # List the Summary folder once; each year only filters this listing.
+    all_summary_files = g.drive.list_files(
+        summary_folder_id, trashed=False, include_folders=False
+    )
+
     years_processed = 0
     summaries_generated = 0
     summaries_skipped_no_canonical = 0
     dedup_runs = 0
 
-    for folder in year_folders:
-        year = folder.name
-        if (year or "").lower() == "summary":
-            continue
+    # One reader pool for the whole run, so each worker builds its client
+    # once rather than once per generated year.
+    with ClientPool(GoogleAPI.from_env, max_workers=_READ_WORKERS) as readers:
+        for folder in year_folders:
+            year = folder.name
+            if (year or "").lower() == "summary":
+                continue
 
-        years_processed += 1
+            years_processed += 1
 
-        summary_name = f"{year} Summary"
+            summary_name = f"{year} Summary"
 
-        # Find existing summaries for this year in the Summary folder (contains match)
-        all_summary_files = g.drive.list_files(
-            summary_folder_id, trashed=False, include_folders=False
-        )
-        existing_summaries = [
-            f for f in all_summary_files if f.name and summary_name in f.name
-        ]
-        existing_names = [f.name for f in existing_summaries]
-        logger.debug(f"Found existing summaries for {year}: {existing_names}")
-
-        canonical = next(
-            (f for f in existing_summaries if f.name == summary_name), None
-        )
-        if canonical:
-            logger.info(
-                f"✅ Summary already exists for {year} — running dedup on '{summary_name}' and continuing"
-            )
-            deduplication.deduplicate_summary(canonical.id, g=g)
-            dedup_runs += 1
-            continue
+            # Find existing summaries for this year in the Summary folder (contains match)
+            existing_summaries = [
+                f for f in all_summary_files if f.name and summary_name in f.name
+            ]
+            existing_names = [f.name for f in existing_summaries]
+            logger.debug(f"Found existing summaries for {year}: {existing_names}")
 
-        if existing_summaries:
-            logger.warning(
-                f"⚠️ Found summary-like files for {year} but no exact '{summary_name}' match. "
-                f"Skipping dedup to avoid modifying the wrong file. Matches: {existing_names}"
+            canonical = next(
+                (f for f in existing_summaries if f.name == summary_name), None
             )
-            summaries_skipped_no_canonical += 1
-            continue
+            if canonical:
+                logger.info(
+                    f"✅ Summary already exists for {year} — running dedup on '{summary_name}' and continuing"
+                )
+                deduplication.deduplicate_summary(canonical.id, g=g)
+                dedup_runs += 1
+                continue
 
-        logger.debug(f"Getting files for year {year}")
-        files = g.drive.list_files(
-            folder.id,
-            mime_type="application/vnd.google-apps.spreadsheet",
-            trashed=False,
-            include_folders=False,
-        )
+            if existing_summaries:
+                logger.warning(
+                    f"⚠️ Found summary-like files for {year} but no exact '{summary_name}' match. "
+                    f"Skipping dedup to avoid modifying the wrong file. Matches: {existing_names}"
+                )
+                summaries_skipped_no_canonical += 1
+                continue
 
-        if any(
-            (f.name or "").startswith("FAILED_") or "_Cleaned" in (f.name or "")
-            for f in files
-        ):
-            logger.info(f"⛔ Skipping year {year} — unready files found")
-            continue
+            logger.debug(f"Getting files for year {year}")
+            files = g.drive.list_files(
+                folder.id,
+                mime_type="application/vnd.google-apps.spreadsheet",
+                trashed=False,
+                include_folders=False,
+            )
 
-        logger.debug(f"Files to process for {year}: {[f.name for f in files]}")
-        logger.info(f"🔧 Generating summary for {year}...")
+            if any(
+                (f.name or "").startswith("FAILED_") or "_Cleaned" in (f.name or "")
+                for f in files
+            ):
+                logger.info(f"⛔ Skipping year {year} — unready files found")
+                continue
+
+            logger.debug(f"Files to process for {year}: {[f.name for f in files]}")
+            logger.info(f"🔧 Generating summary for {year}...")
 
-        if generate_summary_for_folder(g, files, summary_folder_id, year):
-            summaries_generated += 1
+            if generate_summary_for_folder(
+                g, files, summary_folder_id, year, readers=readers
+            ):
+                summaries_generated += 1
 
     post_run_finding(
         flow_name="generate-summaries",
@@ -140,80 +159,37 @@ def generate_summary_for_folder(
     files,
     summary_folder_id: str,
     year: str,
+    readers: ClientPool | None = None,
 ) -> bool:
-    """TODO: describe this function."""
+    """Build, write and deduplicate the summary spreadsheet for one year.
+
+    Source spreadsheets are read through ``readers`` when given, concurrently
+    and with the pool's per-thread clients; otherwise they are read one by one
+    with ``g``.
+    """
     log.debug(
         f"Starting generate_summary_for_folder for year {year} with {len(files)} files"
     )
 
-    def _trim_cell(v: str) -> str:
-        return str(v).strip() if v is not None else ""
-
-    def _canon_header(h: str) -> str:
-        return _trim_cell(h).lower()
-
-    combined_name = f"_TestingOnly_{year}"
     summary_name = f"{year} Summary"
 
     all_headers: set[str] = set()
-    sheet_data: list[tuple[list[str], list[list[str]]]] = []
-
-    for f in files:
-        file_name = f.name or ""
-        log.info(f"🔍 Reading {file_name}")
-
-        sheets_metadata = g.sheets.get_metadata(
-            f.id, fields="sheets(properties(title))"
-        )
-
-        sheets = sheets_metadata.get("sheets", [])
-        if not sheets:
-            log.warning(
-                f"⚠️ No sheets found in spreadsheet {file_name} ({f.id}); skipping"
-            )
-            continue
-
-        for sheet in sheets:
-            sheet_title = sheet.get("properties", {}).get("title")
-            if not sheet_title:
-                log.debug(
-                    f"Skipping sheet with missing title in spreadsheet {file_name}"
-                )
-                continue
-
-            values = g.sheets.read_values(f.id, f"{sheet_title}!A:Z")
-
-            if not values or len(values) < 2:
-                log.warning(f"⚠️ No data in {file_name} - sheet '{sheet_title}'")
-                continue
-
-            header = [_trim_cell(h) for h in values[0]]
-            rows = [[_trim_cell(c) for c in r] for r in values[1:]]
-
-            lower_header = [_canon_header(h) for h in header]
-
-            allowed = {str(h).strip().lower() for h in config.ALLOWED_HEADERS}
-            keep_indices = [i for i, h in enumerate(lower_header) if h in allowed]
-
-            if not keep_indices:
-                continue
-
-            filtered_header = [lower_header[i] for i in keep_indices]
-            filtered_rows: list[list[str]] = []
-
-            for row in rows:
-                if not any((cell or "").strip() for cell in row):
-                    continue
-                padded = row + [""] * (max(keep_indices) + 1 - len(row))
-                filtered_rows.append([padded[i] for i in keep_indices])
-
-            log.debug(
-                f"Filtered header for sheet '{sheet_title}': {filtered_header}, rows: {len(filtered_rows)}"
-            )
-
-            if filtered_rows:
-                all_headers.update(filtered_header)
-                sheet_data.append((filtered_header, filtered_rows))
+    sheet_data: list[_TabData] = []
+    # Canonical allowed headers, built once per run rather than once per tab
+    # (read from config at call time so tests can patch it).
+    allowed = frozenset(_canon_header(h) for h in config.ALLOWED_HEADERS)
+
+    # Source spreadsheets are independent, so a pool reads them concurrently;
+    # map() keeps results in file order, so the summary is unchanged.
+    read_file = partial(_read_summary_sheets, allowed=allowed)
+    if readers is not None:
+        file_results = readers.map(read_file, files)
+    else:
+        file_results = (read_file(g, f) for f in files)
+    for file_sheets in file_results:
+        for tab in file_sheets:
+            all_headers.update(tab[0])
+            sheet_data.append(tab)
 
     if not sheet_data:
         log.info(f"📭 No valid data found in folder: {year}")
@@ -224,19 +200,35 @@ def generate_summary_for_folder(
     desired_map = dict(zip(desired_canon, desired_display, strict=True))
 
     ordered_header = [c for c in desired_canon if c in all_headers]
-    unordered_header = sorted([c for c in all_headers if c not in set(desired_canon)])
+    desired_set = set(desired_canon)
+    unordered_header = sorted([c for c in all_headers if c not in desired_set])
 
     final_header_canon = ordered_header + unordered_header
     final_header = [desired_map.get(c, c) for c in final_header_canon] + ["Count"]
 
+    # Artist/title/genre values repeat heavily across a year's sets; sharing
+    # one str per distinct value keeps the combined rows compact.
+    strings: dict[str, str] = {}
+
+    def share(s: str) -> str:
+        return strings.setdefault(s, s)
+
+    # Trim, select and align in one pass straight from each tab's raw rows,
+    # so no intermediate filtered copy of the data is built.
     final_rows: list[list[str | int]] = []
-    for header, rows in sheet_data:
-        idx_map = {h: i for i, h in enumerate(header)}
+    for header, keep_indices, rows in sheet_data:
+        # Raw source column for each final column (None when this tab lacks
+        # it), resolved once per tab instead of once per cell.
+        idx_map = {h: keep_indices[j] for j, h in enumerate(header)}
+        perm = [idx_map.get(h) for h in final_header_canon]
         for row in rows:
-            aligned = [
-                row[idx_map[h]] if h in idx_map else "" for h in final_header_canon
+            n = len(row)
+            aligned: list[str | int] = [
+                share(_trim_cell(row[p])) if p is not None and p < n else ""
+                for p in perm
             ]
-            final_rows.append(aligned + [1])
+            aligned.append(1)
+            final_rows.append(aligned)
 
     log.debug(
         f"Final header for year {year}: {final_header}, total rows: {len(final_rows)}"
@@ -245,45 +237,117 @@ def generate_summary_for_folder(
     title_canon = _canon_header("Title")
     if title_canon in final_header_canon:
         title_index = final_header_canon.index(title_canon)
-        final_rows.sort(key=lambda r: str(r[title_index]))
+        # Aligned cells are already str, so the title can be the key as-is.
+        final_rows.sort(key=itemgetter(title_index))
     else:
         final_rows.sort(key=lambda r: [str(x) for x in r])
 
-    ss_id = g.drive.create_spreadsheet_in_folder(combined_name, summary_folder_id)
-    log.debug(f"Created spreadsheet ID for {combined_name}: {ss_id}")
+    # Create the year summary under its final name; there is no separate
+    # working copy to duplicate afterwards.
+    ss_id = g.drive.create_spreadsheet_in_folder(summary_name, summary_folder_id)
+    log.debug(f"Created spreadsheet ID for {summary_name}: {ss_id}")
 
-    g.sheets.ensure_sheet_exists(ss_id, "Summary")
+    try:
+        g.sheets.ensure_sheet_exists(ss_id, "Summary")
 
-    log.info(f"Deleting all sheets except 'Summary' in spreadsheet {ss_id}")
-    g.sheets.clear_all_except_one_sheet(ss_id, "Summary")
+        log.info(f"Deleting all sheets except 'Summary' in spreadsheet {ss_id}")
+        g.sheets.clear_all_except_one_sheet(ss_id, "Summary")
 
-    log.info(f"Writing summary data to 'Summary' sheet with {len(final_rows)} rows")
-    rows_to_write = [final_header] + [list(r) for r in final_rows]
-    g.sheets.insert_rows(
-        ss_id,
-        "Summary",
-        rows_to_write,
-        value_input_option="RAW",
-    )
+        log.info(f"Writing summary data to 'Summary' sheet with {len(final_rows)} rows")
+        rows_to_write = [final_header, *final_rows]
+        g.sheets.insert_rows(
+            ss_id,
+            "Summary",
+            rows_to_write,
+            value_input_option="RAW",
+        )
 
-    # Apply common formatting once the data is written.
-    fmt = g.sheets.formatter
-    fmt.apply_formatting_to_sheet(ss_id)
+        # Apply common formatting once the data is written.
+        fmt = g.sheets.formatter
+        fmt.apply_formatting_to_sheet(ss_id)
+    except Exception:
+        # A half-written file under the canonical name would look finished to
+        # the next run, which only deduplicates existing summaries; remove it
+        # so the year is rebuilt instead.
+        log.error(f"Failed to write '{summary_name}'; deleting {ss_id}")
+        try:
+            g.drive.delete_file(ss_id)
+        except Exception as cleanup_exc:
+            log.error(f"Failed to delete partial summary {ss_id}: {cleanup_exc}")
+        raise
+
+    log.info(f"Year summary spreadsheet ID with name '{summary_name}': {ss_id}")
+
+    deduplication.deduplicate_summary(ss_id, g=g)
+    return True
 
-    # Copy the generated combined summary to the year summary name
-    year_summary_id = g.drive.copy_file(
-        ss_id,
-        parent_folder_id=summary_folder_id,
-        name=summary_name,
-    )
 
-    log.info(f"Combined summary spreadsheet ID: {ss_id}")
-    log.info(
-        f"Year summary spreadsheet ID with name '{summary_name}': {year_summary_id}"
-    )
+def _trim_cell(v: str) -> str:
+    return str(v).strip() if v is not None else ""
 
-    deduplication.deduplicate_summary(year_summary_id, g=g)
-    return True
+
+# Header cells repeat across every tab and file in a run; memoize them.
+@lru_cache(maxsize=2048)
+def _canon_header(h: str) -> str:
+    return _trim_cell(h).lower()
+
+
+def _read_summary_sheets(g: GoogleAPI, f, allowed: frozenset[str]) -> list[_TabData]:
+    """Read one source spreadsheet's usable tabs.
+
+    Each tab comes back as (canonical kept headers, their raw column indices,
+    non-blank raw rows); cells are trimmed later, while aligning.
+    """
+    values_api = g.sheets.service.spreadsheets().values()
+
+    file_name = f.name or ""
+    log.info(f"🔍 Reading {file_name}")
+
+    sheets_metadata = g.sheets.get_metadata(f.id, fields="sheets(properties(title))")
+
+    sheets = sheets_metadata.get("sheets", [])
+    if not sheets:
+        log.warning(f"⚠️ No sheets found in spreadsheet {file_name} ({f.id}); skipping")
+        return []
+
+    sheet_titles: list[str] = []
+    for sheet in sheets:
+        sheet_title = sheet.get("properties", {}).get("title")
+        if not sheet_title:
+            log.debug(f"Skipping sheet with missing title in spreadsheet {file_name}")
+            continue
+        sheet_titles.append(sheet_title)
+
+    # One values.batchGet per spreadsheet instead of a read per tab.
+    tab_values = batch_get_values(values_api, f.id, sheet_titles)
+
+    file_sheets: list[_TabData] = []
+    for sheet_title, values in zip(sheet_titles, tab_values, strict=True):
+        if not values or len(values) < 2:
+            log.warning(f"⚠️ No data in {file_name} - sheet '{sheet_title}'")
+            continue
+
+        lower_header = [_canon_header(h) for h in values[0]]
+
+        keep_indices = [i for i, h in enumerate(lower_header) if h in allowed]
+
+        if not keep_indices:
+            continue
+
+        filtered_header = [lower_header[i] for i in keep_indices]
+
+        # Formatted values from the Sheets API are always str, so a row is
+        # blank exactly when its joined text is.
+        filtered_rows = [row for row in values[1:] if "".join(row).strip()]
+
+        log.debug(
+            f"Filtered header for sheet '{sheet_title}': {filtered_header}, rows: {len(filtered_rows)}"
+        )
+
+        if filtered_rows:
+            file_sheets.append((filtered_header, keep_indices, filtered_rows))
+
+    return file_sheets
 
 
 if __name__ == "__main__":
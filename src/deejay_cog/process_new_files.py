@@ -1,6 +1,7 @@
 import contextlib
 import os
 import re
+import time
 from dataclasses import dataclass, field
 
 from mini_app_polis import logger as logger_mod
@@ -28,9 +29,29 @@ log = logger_mod.get_logger()
 os.environ.setdefault("CSV_SOURCE_FOLDER_ID", "1t4d_8lMC3ZJfSyainbpwInoDta7n69hC")
 os.environ.setdefault("DJ_SETS_FOLDER_ID", "1A0tKQ2DBXI1Bt9h--olFwnBNne3am-rL")
 
+# Status prefixes stripped by normalize_prefixes_in_source (case-insensitive).
+_STATUS_PREFIX_RE = re.compile(
+    r"^(?:FAILED_|possible_duplicate_|Copy of )", re.IGNORECASE
+)
+
+# Filename patterns, compiled once: "YYYY-..." / "YYYY_..." and "YYYY-MM-DD Venue".
+_YEAR_PREFIX_RE = re.compile(r"(\d{4})[-_]")
+_DATE_VENUE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\s+(.+)$")
+
+# Drive accepts at most 100 calls in one batch request.
+_DRIVE_BATCH_LIMIT = 100
+
+# Whitespace runs collapsed to one space on each normalized CSV line.
+_WHITESPACE_RE = re.compile(r"\s+")
+
 # Retry backoff: zero delay under pytest so retries do not slow the suite.
 _INGEST_TO_API_RETRY_DELAY = 0 if os.getenv("PYTEST_CURRENT_TEST") else 30
 
+# Drive rename/move attempts and the first backoff delay (doubled per retry);
+# zero delay under pytest, as above.
+_DRIVE_MUTATION_ATTEMPTS = 3
+_DRIVE_RETRY_BASE_DELAY = 0 if os.getenv("PYTEST_CURRENT_TEST") else 1.0
+
 
 @dataclass
 class CsvPipelineStats:
@@ -53,6 +74,35 @@ class CsvPipelineStats:
     track_read_failed: int = 0
 
 
+@dataclass
+class DriveRunCache:
+    """Drive lookups reused across one process_new_files run.
+
+    folders maps (parent id, name) to the folder id ensure_folder resolved.
+    base_names maps a folder id to the base names (extension stripped) of the
+    files in it; entries are listed once and kept current as files land.
+    summary_ids maps each file name in the Summary folder to its ids; it is
+    listed on first use and a name is dropped once its files are deleted.
+    """
+
+    folders: dict[tuple[str, str], str] = field(default_factory=dict)
+    base_names: dict[str, set[str]] = field(default_factory=dict)
+    summary_ids: dict[str, list[str]] | None = None
+
+
+def _ensure_folder(
+    g: GoogleAPI, parent_id: str, name: str, cache: DriveRunCache | None = None
+) -> str:
+    """Return the id of folder ``name`` under ``parent_id``, once per run."""
+    if cache is None:
+        return g.drive.ensure_folder(parent_id, name)
+    key = (parent_id, name)
+    folder_id = cache.folders.get(key)
+    if folder_id is None:
+        folder_id = cache.folders[key] = g.drive.ensure_folder(parent_id, name)
+    return folder_id
+
+
 def normalize_prefixes_in_source(drive) -> None:
     """Remove leading status prefixes from files in the CSV source folder.
 
@@ -60,13 +110,10 @@ def normalize_prefixes_in_source(drive) -> None:
     this will attempt to rename it to the stripped base name, but only if that target name does
     not already exist in the source folder.
 
-    This function expects the new Drive facade / DriveFacade interface.
+    This function expects the new Drive facade / DriveFacade interface. Renames
+    are sent in Drive batch requests through the facade's raw ``service`` client.
     """
 
-    FAILED_PREFIX = "FAILED_"
-    POSSIBLE_DUPLICATE_PREFIX = "possible_duplicate_"
-    COPY_OF_PREFIX = "Copy of "
-
     try:
         log.debug("normalize_prefixes_in_source: listing source folder files")
         files = drive.list_files(
@@ -74,93 +121,234 @@ def normalize_prefixes_in_source(drive) -> None:
         )
         log.info(f"normalize_prefixes_in_source: found {len(files)} files to inspect")
 
+        # Only prefixed files need work; a clean folder stops here, before the
+        # name lookup is built.
+        prefixed = [f for f in files if _STATUS_PREFIX_RE.match(f.name or "")]
+        if not prefixed:
+            return
+
         # Build a quick lookup of names already present in the folder
         existing_names = {f.name for f in files if f.name}
 
-        for f in files:
-            original_name = f.name or ""
-            lower = original_name.lower()
-            prefix = None
-
-            if lower.startswith(FAILED_PREFIX.lower()):
-                prefix = original_name[: len(FAILED_PREFIX)]
-            elif lower.startswith(POSSIBLE_DUPLICATE_PREFIX.lower()):
-                prefix = original_name[: len(POSSIBLE_DUPLICATE_PREFIX)]
-            elif lower.startswith(COPY_OF_PREFIX.lower()):
-                prefix = original_name[: len(COPY_OF_PREFIX)]
-
-            if not prefix:
-                continue
-
-            new_name = original_name[len(prefix) :]
-            if not new_name:
-                log.warning(
-                    f"normalize_prefixes_in_source: derived empty new name for {original_name}, skipping"
-                )
-                continue
+        # A target name is only taken once its rename succeeds. Files whose
+        # target is already queued in this round wait for the outcome and are
+        # tried again in the next round if that rename fails.
+        pending = prefixed
+        while pending:
+            renames: list[tuple[str, str, str]] = []
+            waiting: dict[str, list] = {}
+
+            for f in pending:
+                original_name = f.name or ""
+                new_name, stripped = _STATUS_PREFIX_RE.subn("", original_name, count=1)
+                if not stripped:
+                    continue
+
+                if not new_name:
+                    log.warning(
+                        f"normalize_prefixes_in_source: derived empty new name for {original_name}, skipping"
+                    )
+                    continue
+
+                if new_name in waiting:
+                    waiting[new_name].append(f)
+                    continue
+
+                if new_name in existing_names:
+                    log.info(
+                        f"normalize_prefixes_in_source: target name '{new_name}' already exists in source folder — leaving '{original_name}' as-is"
+                    )
+                    continue
 
-            if new_name in existing_names:
-                log.info(
-                    f"normalize_prefixes_in_source: target name '{new_name}' already exists in source folder — leaving '{original_name}' as-is"
-                )
-                continue
-
-            try:
                 log.info(
                     f"normalize_prefixes_in_source: renaming '{original_name}' -> '{new_name}'"
                 )
-                drive.rename_file(f.id, new_name)
+                renames.append((f.id, original_name, new_name))
+                waiting[new_name] = []
+
+            failed = _rename_files_batched(drive, renames) if renames else set()
+
+            pending = []
+            for file_id, original_name, new_name in renames:
+                if file_id in failed:
+                    pending.extend(waiting[new_name])
+                    continue
                 # Keep our local set consistent for subsequent checks in this run
                 existing_names.discard(original_name)
                 existing_names.add(new_name)
-            except Exception as e:
-                log.error(
-                    f"normalize_prefixes_in_source: failed to rename {original_name}: {e}"
-                )
+                for f in waiting[new_name]:
+                    log.info(
+                        f"normalize_prefixes_in_source: target name '{new_name}' already exists in source folder — leaving '{f.name}' as-is"
+                    )
 
     except Exception as e:
         log.error(f"normalize_prefixes_in_source: unexpected error: {e}")
 
 
+def _rename_files_batched(drive, renames: list[tuple[str, str, str]]) -> set[str]:
+    """Rename (file_id, original_name, new_name) entries via Drive batch requests.
+
+    Up to _DRIVE_BATCH_LIMIT renames share one HTTP round trip; a failed rename
+    is logged and does not stop the others. Returns the ids of files that were
+    not renamed.
+    """
+    service = drive.service
+    failed: set[str] = set()
+    for start in range(0, len(renames), _DRIVE_BATCH_LIMIT):
+        chunk = renames[start : start + _DRIVE_BATCH_LIMIT]
+
+        def _on_done(request_id, _response, exception, chunk=chunk):
+            if exception is not None:
+                file_id, original_name, _new_name = chunk[int(request_id)]
+                failed.add(file_id)
+                log.error(
+                    f"normalize_prefixes_in_source: failed to rename {original_name}: {exception}"
+                )
+
+        batch = service.new_batch_http_request(callback=_on_done)
+        for i, (file_id, _original_name, new_name) in enumerate(chunk):
+            batch.add(
+                service.files().update(
+                    fileId=file_id,
+                    body={"name": new_name},
+                    supportsAllDrives=True,
+                    fields="id",
+                ),
+                request_id=str(i),
+            )
+        try:
+            batch.execute()
+        except Exception as e:
+            failed.update(file_id for file_id, _, _ in chunk)
+            log.error(f"normalize_prefixes_in_source: batch rename failed: {e}")
+    return failed
+
+
 # --- Utility: remove summary file for a given year ---
-def remove_summary_file_for_year(g: GoogleAPI, year: str) -> None:
-    """Remove the summary sheet for the given year from Drive if it exists."""
+def remove_summary_file_for_year(
+    g: GoogleAPI, year: str, cache: DriveRunCache | None = None
+) -> None:
+    """Remove the summary sheet for the given year from Drive if it exists.
+
+    The Summary folder is listed once per ``cache`` and looked up by name from
+    then on; without a cache, a throwaway one is used for this call.
+    """
+    if cache is None:
+        cache = DriveRunCache()
     try:
-        summary_folder_id = g.drive.ensure_folder(config.DJ_SETS_FOLDER_ID, "Summary")
+        summary_folder_id = _ensure_folder(
+            g, config.DJ_SETS_FOLDER_ID, "Summary", cache
+        )
         summary_name = f"{year} Summary"
 
-        # List files in the Summary folder and delete any exact name matches
-        files = g.drive.list_files(
-            summary_folder_id, include_folders=False, trashed=False
-        )
-        for f in files:
-            if (f.name or "") == summary_name:
-                g.drive.delete_file(f.id)
-                log.info(
-                    f"🗑️ Deleted existing summary file '{summary_name}' for year {year}"
-                )
+        if cache.summary_ids is None:
+            summary_ids: dict[str, list[str]] = {}
+            for f in g.drive.list_files(
+                summary_folder_id, include_folders=False, trashed=False
+            ):
+                summary_ids.setdefault(f.name or "", []).append(f.id)
+            cache.summary_ids = summary_ids
+        file_ids = cache.summary_ids.get(summary_name, [])
+
+        # Forget an id only once its delete succeeds, so a failed delete is
+        # retried by the next file for this year.
+        for file_id in list(file_ids):
+            g.drive.delete_file(file_id)
+            file_ids.remove(file_id)
+            log.info(
+                f"🗑️ Deleted existing summary file '{summary_name}' for year {year}"
+            )
     except Exception as e:
         log.error(f"Failed to remove summary file for year {year}: {e}")
 
 
 # --- Utility: check for duplicate base filename in a folder ---
-def file_exists_with_base_name(g: GoogleAPI, folder_id: str, base_name: str) -> bool:
-    """Return True if a file with the given base name exists in the folder."""
+def file_exists_with_base_name(
+    g: GoogleAPI,
+    folder_id: str,
+    base_name: str,
+    cache: DriveRunCache | None = None,
+) -> bool:
+    """Return True if a file with the given base name exists in the folder.
+
+    With a cache, the folder is listed once per run and later checks are
+    answered from the cached base names.
+    """
+    if cache is not None and folder_id in cache.base_names:
+        return base_name in cache.base_names[folder_id]
     try:
         candidates = g.drive.list_files(folder_id, include_folders=False, trashed=False)
-        for f in candidates:
-            if os.path.splitext(f.name or "")[0] == base_name:
-                return True
+        names = {os.path.splitext(f.name or "")[0] for f in candidates}
     except Exception as e:
         log.error(f"Error checking for duplicates in folder {folder_id}: {e}")
-    return False
+        return False
+    if cache is not None:
+        cache.base_names[folder_id] = names
+    return base_name in names
+
+
+def _record_base_name(
+    cache: DriveRunCache | None, folder_id: str, base_name: str
+) -> None:
+    """Note a file that just landed in folder_id so later checks see it."""
+    if cache is not None and folder_id in cache.base_names:
+        cache.base_names[folder_id].add(base_name)
+
+
+def _retry_drive_mutation(mutate, verify, label: str) -> None:
+    """Run a Drive rename/move, retrying failed attempts with backoff.
+
+    Drive can apply a write and still report an error, so after a failure
+    ``verify()`` checks whether the change landed before trying again. The
+    last error is re-raised once the attempts run out.
+    """
+    for attempt in range(_DRIVE_MUTATION_ATTEMPTS):
+        try:
+            mutate()
+            return
+        except Exception as exc:
+            if verify():
+                log.info(f"{label}: applied despite error: {exc}")
+                return
+            if attempt == _DRIVE_MUTATION_ATTEMPTS - 1:
+                raise
+            delay = _DRIVE_RETRY_BASE_DELAY * 2**attempt
+            log.warning(f"{label} failed: {exc}. Retrying in {delay:g}s")
+            time.sleep(delay)
+
+
+def _file_has_name(g: GoogleAPI, file_id: str, name: str) -> bool:
+    """Return True if Drive reports file_id as named name (False on error)."""
+    try:
+        meta = g.drive.service.files().get(fileId=file_id, fields="name").execute()
+        return meta.get("name") == name
+    except Exception:
+        return False
+
+
+def _rename_with_retry(g: GoogleAPI, file_id: str, new_name: str) -> None:
+    _retry_drive_mutation(
+        lambda: g.drive.rename_file(file_id, new_name),
+        lambda: _file_has_name(g, file_id, new_name),
+        f"Rename to '{new_name}'",
+    )
+
+
+def _move_with_retry(g: GoogleAPI, file_id: str, folder_id: str) -> None:
+    _retry_drive_mutation(
+        lambda: g.drive.move_file(
+            file_id, new_parent_id=folder_id, remove_from_parents=True
+        ),
+        lambda: _file_already_in_folder(g, file_id, folder_id),
+        f"Move of {file_id} to {folder_id}",
+    )
 
 
 def rename_file_as_duplicate(g: GoogleAPI, file_id: str, filename: str) -> None:
     """Rename a file with a possible_duplicate_ prefix to flag it for review."""
     try:
         new_name = f"possible_duplicate_{filename}"
-        g.drive.rename_file(file_id, new_name)
+        _rename_with_retry(g, file_id, new_name)
         log.info(f"✏️ Renamed original to '{new_name}'")
     except Exception as rename_exc:
         log.error(f"Failed to rename original to possible_duplicate_: {rename_exc}")
@@ -171,25 +359,25 @@ def process_non_csv_file(
     file_metadata: dict,
     year: str,
     stats: CsvPipelineStats | None = None,
+    cache: DriveRunCache | None = None,
 ) -> None:
     """Move a non-CSV file that starts with a year into the correct year folder."""
     filename = file_metadata["name"]
     file_id = file_metadata["id"]
     log.info(f"\n📄 Moving non-CSV file that starts with year: {filename}")
     try:
-        year_folder_id = g.drive.ensure_folder(config.DJ_SETS_FOLDER_ID, year)
+        year_folder_id = _ensure_folder(g, config.DJ_SETS_FOLDER_ID, year, cache)
         base_name = os.path.splitext(filename)[0]
-        if file_exists_with_base_name(g, year_folder_id, base_name):
+        if file_exists_with_base_name(g, year_folder_id, base_name, cache):
             rename_file_as_duplicate(g, file_id, filename)
             if stats is not None:
                 stats.sets_skipped_non_csv += 1
             return
 
-        g.drive.move_file(
-            file_id, new_parent_id=year_folder_id, remove_from_parents=True
-        )
+        _move_with_retry(g, file_id, year_folder_id)
+        _record_base_name(cache, year_folder_id, base_name)
         log.info(f"📦 Moved original file to {year} subfolder: {filename}")
-        remove_summary_file_for_year(g, year)
+        remove_summary_file_for_year(g, year, cache)
         if stats is not None:
             stats.sets_skipped_non_csv += 1
     except Exception as e:
@@ -198,7 +386,7 @@ def process_non_csv_file(
 
 def _extract_year_from_filename(filename: str) -> str | None:
     log.debug(f"extract_year_from_filename called with filename: {filename}")
-    match = re.match(r"(\d{4})[-_]", filename)
+    match = _YEAR_PREFIX_RE.match(filename)
     year = match.group(1) if match else None
     log.debug(f"Extracted year: {year} from filename: {filename}")
     return year
@@ -212,7 +400,7 @@ def _extract_date_and_venue(
     Returns (date_str, venue_str) or (None, None) if no match.
     e.g. "2024-01-15 MADjam" → ("2024-01-15", "MADjam")
     """
-    match = re.match(r"^(\d{4}-\d{2}-\d{2})\s+(.+)$", base_name.strip())
+    match = _DATE_VENUE_RE.match(base_name.strip())
     if not match:
         return None, None
     return match.group(1), match.group(2)
@@ -233,8 +421,10 @@ def _normalize_csv(file_path: str) -> None:
     logger = get_prefect_logger()
     logger.debug(f"normalize_csv called with file_path: {file_path} - reading file")
 
+    # One read; text mode already folds \r\n / \r to \n, so splitting on
+    # "\n" yields the same lines readlines() would (minus the newlines).
     with open(file_path) as f:
-        lines = f.readlines()
+        lines = f.read().split("\n")
 
     cleaned_lines: list[str] = []
     for i, line in enumerate(lines):
@@ -250,7 +440,7 @@ def _normalize_csv(file_path: str) -> None:
             logger.info(f"Removed CSV separator hint line: {raw}")
             continue
 
-        cleaned = re.sub(r"\s+", " ", raw)
+        cleaned = _WHITESPACE_RE.sub(" ", raw)
         cleaned_lines.append(cleaned)
 
     logger.debug(f"Lines after cleaning: {len(cleaned_lines)}")
@@ -268,13 +458,14 @@ def _upload_csv_to_sheets(
     year_folder_id: str,
     year: str,
     filename: str,
+    cache: DriveRunCache | None = None,
 ) -> str:
     """Upload normalized CSV as a Google Sheet, apply formatting, invalidate summary."""
     logger = get_prefect_logger()
     sheet_id = g.drive.upload_csv_as_google_sheet(temp_path, parent_id=year_folder_id)
     logger.debug("Uploaded sheet ID: %s", sheet_id)
     g.sheets.formatter.apply_formatting_to_sheet(sheet_id)
-    remove_summary_file_for_year(g, year)
+    remove_summary_file_for_year(g, year, cache)
     logger.debug("upload-to-sheets complete for %s", filename)
     return sheet_id
 
@@ -418,6 +609,7 @@ def process_csv_file(
     file_metadata: dict,
     year: str,
     stats: CsvPipelineStats | None = None,
+    cache: DriveRunCache | None = None,
 ) -> str:
     """Process one CSV. Returns imported | failed | duplicate."""
     logger = get_prefect_logger()
@@ -431,9 +623,9 @@ def process_csv_file(
         _normalize_csv(temp_path)
         logger.info(f"Downloaded and normalized file: {filename}")
 
-        year_folder_id = g.drive.ensure_folder(config.DJ_SETS_FOLDER_ID, year)
+        year_folder_id = _ensure_folder(g, config.DJ_SETS_FOLDER_ID, year, cache)
         base_name = os.path.splitext(filename)[0]
-        if file_exists_with_base_name(g, year_folder_id, base_name):
+        if file_exists_with_base_name(g, year_folder_id, base_name, cache):
             logger.warning(
                 f"⚠️ Destination already contains file with base name '{base_name}' in year folder {year_folder_id}. Marking original as possible duplicate and skipping."
             )
@@ -442,7 +634,10 @@ def process_csv_file(
                 stats.duplicate_csv += 1
             return "duplicate"
 
-        sheet_id = _upload_csv_to_sheets(g, temp_path, year_folder_id, year, filename)
+        sheet_id = _upload_csv_to_sheets(
+            g, temp_path, year_folder_id, year, filename, cache
+        )
+        _record_base_name(cache, year_folder_id, base_name)
 
         if stats is not None:
             stats.sets_imported += 1
@@ -457,7 +652,7 @@ def process_csv_file(
                     stats.track_read_failed += 1
 
         try:
-            archive_folder_id = g.drive.ensure_folder(year_folder_id, "Archive")
+            archive_folder_id = _ensure_folder(g, year_folder_id, "Archive", cache)
             if _file_already_in_folder(g, file_id, archive_folder_id):
                 logger.info(
                     f"📦 Already archived: {filename} "
@@ -465,11 +660,7 @@ def process_csv_file(
                     "likely a retry after partial-failure."
                 )
             else:
-                g.drive.move_file(
-                    file_id,
-                    new_parent_id=archive_folder_id,
-                    remove_from_parents=True,
-                )
+                _move_with_retry(g, file_id, archive_folder_id)
                 logger.info(f"📦 Moved original file to Archive subfolder: {filename}")
 
             base_name = os.path.splitext(filename)[0]
@@ -508,7 +699,7 @@ def process_csv_file(
         logger.error(f"❌ Failed to upload or format {filename}: {e}")
         try:
             failed_name = f"FAILED_{filename}"
-            g.drive.rename_file(file_id, failed_name)
+            _rename_with_retry(g, file_id, failed_name)
             logger.info(f"✏️ Renamed original to '{failed_name}'")
             if stats is not None:
                 stats.sets_failed += 1
@@ -545,6 +736,9 @@ def process_new_csv_files_flow() -> None:
     logger.info(f"Found {len(files)} files in source folder")
 
     stats = CsvPipelineStats()
+    # Year/Archive/Summary folders are resolved, and year folders listed, once
+    # per run instead of once per file.
+    cache = DriveRunCache()
 
     for file_metadata in files:
         filename = file_metadata["name"]
@@ -558,13 +752,13 @@ def process_new_csv_files_flow() -> None:
 
         # If the file is not a CSV but starts with a year, move it straight to the year folder
         if not filename.lower().endswith(".csv"):
-            process_non_csv_file(g, file_metadata, year, stats)
+            process_non_csv_file(g, file_metadata, year, stats, cache=cache)
             continue
 
         # At this point we only process CSVs
         stats.sets_attempted += 1
         try:
-            process_csv_file(g, file_metadata, year, stats)
+            process_csv_file(g, file_metadata, year, stats, cache=cache)
         except Exception as e:
             logger.error(
                 "❌ Unexpected error processing %s — continuing to next file: %s",
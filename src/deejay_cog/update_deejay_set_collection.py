@@ -13,22 +13,42 @@ flag passed to the pipeline_eval helpers prevents any API call.
 """
 
 import json
+import os
 import pathlib
 import re
+from collections.abc import Collection
+from operator import itemgetter
 
 from mini_app_polis import logger as logger_mod
 from mini_app_polis.google import GoogleAPI
 from prefect import flow
 
 import deejay_cog.config as config
+from deejay_cog._google_clients import ClientPool
 from deejay_cog._pipeline_eval import (
     get_prefect_logger,
     make_failure_hook,
     post_run_finding,
 )
+from deejay_cog._sheets import API_RETRIES
 
 log = logger_mod.get_logger()
 
+# Worker threads listing year folders (see ClientPool).
+_LIST_WORKERS = 8
+
+_SPREADSHEET_MIME = "application/vnd.google-apps.spreadsheet"
+
+# Leading "YYYY-MM-DD" date of a set file name, and the rest of the name.
+_DATE_TITLE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})(.*)")
+
+
+def _hyperlink(url: str, label: str) -> str:
+    """Return a HYPERLINK formula; quotes are doubled as formula strings need."""
+    url = url.replace('"', '""')
+    label = label.replace('"', '""')
+    return f'=HYPERLINK("{url}", "{label}")'
+
 
 def _create_collection_snapshot(key: str) -> dict:
     """Return an empty snapshot dict with the given top-level key."""
@@ -36,10 +56,20 @@ def _create_collection_snapshot(key: str) -> dict:
 
 
 def _write_json_snapshot(data: dict, path: str) -> None:
-    """Write data as formatted JSON to path, creating parent dirs as needed."""
+    """Write data as formatted JSON to path, creating parent dirs as needed.
+
+    The JSON goes to a sibling temp file that then replaces path, so a failed
+    or interrupted run never leaves a truncated snapshot behind.
+    """
     out = pathlib.Path(path)
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 @flow(
@@ -78,7 +108,27 @@ def generate_dj_set_collection():
     logger.debug(f"Retrieved {len(subfolders)} subfolders")
     subfolders.sort(key=lambda f: f.name, reverse=True)
 
+    # List every non-archive folder up front; the listings are independent
+    # round trips, so they overlap instead of running one after another.
+    listed = [f for f in subfolders if f.name.lower() != "archive"]
+    folder_files: dict[str, list] = {}
+    if listed:
+        workers = min(_LIST_WORKERS, len(listed))
+        with ClientPool(GoogleAPI.from_env, max_workers=workers) as listers:
+            folder_ids = [f.id for f in listed]
+            folder_files = dict(
+                zip(
+                    folder_ids,
+                    listers.map(_list_folder_files, folder_ids),
+                    strict=True,
+                )
+            )
+
     tabs_to_add: list[str] = []
+    # (tab title, header + rows of CellData) for every tab, written together
+    # after the loop in final sheet order: year tabs, then Summary.
+    tab_values: list[tuple[str, list[list[dict]]]] = []
+    summary_tab: tuple[str, list[list[dict]]] | None = None
 
     # Build a JSON snapshot alongside the Google Sheet output.
     collection_snapshot = _create_collection_snapshot("folders")
@@ -87,21 +137,21 @@ def generate_dj_set_collection():
         name = folder.name
         folder_id = folder.id
         logger.info(f"📁 Processing folder: {name} (id: {folder_id})")
+        name_lower = name.lower()
+        is_summary = name_lower == "summary"
 
-        if name.lower() == "archive":
+        if name_lower == "archive":
             logger.info(f"⏭️ Skipping folder: {name} (archive folder)")
             continue
 
-        folder_snapshot = {
-            "name": name,
-            "folder_id": folder_id,
-            "items": [],
-        }
-        collection_snapshot["folders"].append(folder_snapshot)
+        # Snapshot items double as the tab's rows, sorted once for both.
+        items: list[dict] = []
+        collection_snapshot["folders"].append(
+            {"name": name, "folder_id": folder_id, "items": items}
+        )
 
-        files = g.drive.get_files_in_folder(folder_id, include_folders=False)
+        files = folder_files[folder_id]
         logger.debug(f"Found {len(files)} files in folder '{name}'")
-        rows = []
 
         for f in files:
             file_name = f.name or ""
@@ -111,21 +161,20 @@ def generate_dj_set_collection():
                 f"Processing file: Name='{file_name}', MIME='{mime_type}', URL='{file_url}'"
             )
 
-            if mime_type != "application/vnd.google-apps.spreadsheet":
+            if mime_type != _SPREADSHEET_MIME:
                 continue
 
-            if name.lower() == "summary":
-                folder_snapshot["items"].append(
+            if is_summary:
+                items.append(
                     {
                         "label": file_name,
                         "url": file_url,
                         "spreadsheet_id": f.id,
                     }
                 )
-                rows.append([f'=HYPERLINK("{file_url}", "{file_name}")', file_name])
             else:
                 date, title = _extract_date_and_title(file_name)
-                folder_snapshot["items"].append(
+                items.append(
                     {
                         "date": date,
                         "title": title,
@@ -134,52 +183,52 @@ def generate_dj_set_collection():
                         "spreadsheet_id": f.id,
                     }
                 )
-                date_cell = f"'{date}" if date else ""
-                title_cell = f"'{title}" if title else ""
-                rows.append(
-                    [date_cell, title_cell, f'=HYPERLINK("{file_url}", "{file_name}")']
-                )
 
-        if name.lower() == "summary":
-            if rows:
-                all_rows = sorted(rows, key=lambda r: r[1], reverse=True)
-                logger.debug(f"Adding Summary sheet with {len(all_rows)} rows")
-                # add Summary sheet
-                logger.info("➕ Adding Summary sheet")
-                logger.info("Inserting rows into Summary sheet")
-                g.sheets.insert_rows(
-                    spreadsheet_id,
-                    config.SUMMARY_TAB_NAME,
-                    [["Link"]] + [[r[0]] for r in all_rows],
-                    value_input_option="USER_ENTERED",
-                )
-        elif rows:
-            rows.sort(key=lambda r: r[0], reverse=True)
-            logger.debug(f"Adding sheet for folder '{name}' with {len(rows)} rows")
+        if not items:
+            continue
+        if is_summary:
+            items.sort(key=itemgetter("label"), reverse=True)
+            logger.debug(f"Adding Summary sheet with {len(items)} rows")
+            logger.info("➕ Adding Summary sheet")
+            summary_tab = (
+                config.SUMMARY_TAB_NAME,
+                [[_text_cell("Link")]]
+                + [[_formula_cell(_hyperlink(i["url"], i["label"]))] for i in items],
+            )
+        else:
+            # Newest date first; label breaks ties.
+            items.sort(key=itemgetter("date", "label"), reverse=True)
+            logger.debug(f"Adding sheet for folder '{name}' with {len(items)} rows")
             logger.info(f"➕ Adding sheet for folder '{name}'")
-            logger.info(f"Inserting rows into sheet '{name}'")
-            g.sheets.insert_rows(
-                spreadsheet_id,
-                name,
-                [["Date", "Name", "Link"]] + rows,
-                value_input_option="USER_ENTERED",
+            tab_values.append(
+                (
+                    name,
+                    [[_text_cell("Date"), _text_cell("Name"), _text_cell("Link")]]
+                    + [
+                        [
+                            _text_cell(i["date"]),
+                            _text_cell(i["title"]),
+                            _formula_cell(_hyperlink(i["url"], i["label"])),
+                        ]
+                        for i in items
+                    ],
+                )
             )
-            # Keep Date/Name as plain text; Link remains a formula.
-            fmt.set_column_text_formatting(spreadsheet_id, name, [0, 1])
             tabs_to_add.append(name)
 
-    # Sort snapshot folders and items to match the spreadsheet ordering.
-    for folder_snapshot in collection_snapshot["folders"]:
-        if folder_snapshot["name"].lower() == "summary":
-            folder_snapshot["items"].sort(
-                key=lambda x: x.get("label", ""), reverse=True
-            )
-        else:
-            # Prefer date sorting when present; fall back to label.
-            folder_snapshot["items"].sort(
-                key=lambda x: (x.get("date", ""), x.get("label", "")),
-                reverse=True,
-            )
+    if summary_tab is not None:
+        tab_values.append(summary_tab)
+    logger.info(
+        f"Writing {len(tab_values)} sheets and dropping {config.TEMP_TAB_NAME} "
+        "and 'Sheet1' if they exist"
+    )
+    _write_collection_tabs(
+        g,
+        spreadsheet_id,
+        tab_values,
+        text_tabs=set(tabs_to_add),
+        drop_titles={config.TEMP_TAB_NAME, "Sheet1"},
+    )
 
     # Determine output path for the JSON snapshot.
     json_output_path = (
@@ -196,27 +245,8 @@ def generate_dj_set_collection():
             f"Failed to write DJ set collection JSON snapshot to: {json_output_path}"
         )
 
-    # Clean up temp sheets if any
-    logger.info(
-        f"Deleting temp sheets: {config.TEMP_TAB_NAME} and 'Sheet1' if they exist"
-    )
-    g.sheets.delete_sheet_by_name(spreadsheet_id, config.TEMP_TAB_NAME)
-    g.sheets.delete_sheet_by_name(spreadsheet_id, "Sheet1")
-
     logger.info("Setting column formatting for spreadsheet")
     fmt.apply_formatting_to_sheet(spreadsheet_id)
-
-    # Reorder sheets: tabs_to_add then Summary
-    logger.info(
-        f"Reordering sheets with order: {tabs_to_add + [config.SUMMARY_TAB_NAME]}"
-    )
-    metadata = g.sheets.get_metadata(spreadsheet_id)
-    fmt.reorder_sheets(
-        spreadsheet_id,
-        tabs_to_add + [config.SUMMARY_TAB_NAME],
-        metadata,
-    )
-    logger.info("Completed reordering sheets")
     logger.info("✅ Finished generate_dj_set_collection")
 
     post_run_finding(
@@ -236,8 +266,97 @@ def generate_dj_set_collection():
     )
 
 
+def _list_folder_files(g: GoogleAPI, folder_id: str) -> list:
+    """List the files (not subfolders) of one year folder."""
+    return g.drive.get_files_in_folder(folder_id, include_folders=False)
+
+
+def _write_collection_tabs(
+    g: GoogleAPI,
+    spreadsheet_id: str,
+    tab_values: list[tuple[str, list[list[dict]]]],
+    text_tabs: set[str],
+    drop_titles: Collection[str] = (),
+) -> None:
+    """Create, format and fill every collection tab in one batchUpdate.
+
+    Each tab's rows are CellData lists (see _text_cell/_formula_cell), so the
+    caller decides per column what is a formula. Tabs are added at the front
+    in ``tab_values`` order. Sheet ids are
+    assigned up front, past the ids already in the spreadsheet, so the
+    formatting and updateCells requests can address the new tabs in the same
+    call that adds them. The Date/Name columns of ``text_tabs`` are kept as
+    plain text, and existing sheets titled in ``drop_titles`` are deleted once
+    the new tabs exist.
+    """
+    if not tab_values:
+        return
+    sheets_api = g.sheets.service.spreadsheets()
+    metadata = g.sheets.get_metadata(
+        spreadsheet_id, fields="sheets.properties(sheetId,title)"
+    )
+    existing = {
+        s["properties"]["title"]: s["properties"]["sheetId"]
+        for s in metadata.get("sheets", [])
+    }
+    next_id = 1 + max(existing.values(), default=0)
+    sheet_ids = {title: next_id + i for i, (title, _) in enumerate(tab_values)}
+
+    requests: list[dict] = [
+        {"addSheet": {"properties": {"sheetId": sid, "title": title, "index": i}}}
+        for i, (title, sid) in enumerate(sheet_ids.items())
+    ]
+    # Keep Date/Name as plain text; Link remains a formula.
+    requests += [
+        {
+            "repeatCell": {
+                "range": {
+                    "sheetId": sheet_ids[title],
+                    "startColumnIndex": 0,
+                    "endColumnIndex": 2,
+                },
+                "cell": {"userEnteredFormat": {"numberFormat": {"type": "TEXT"}}},
+                "fields": "userEnteredFormat.numberFormat",
+            }
+        }
+        for title in sheet_ids
+        if title in text_tabs
+    ]
+    requests += [
+        {
+            "updateCells": {
+                "start": {"sheetId": sheet_ids[title], "rowIndex": 0, "columnIndex": 0},
+                "rows": [{"values": row} for row in values],
+                "fields": "userEnteredValue",
+            }
+        }
+        for title, values in tab_values
+    ]
+    # Deleted last, so the spreadsheet always keeps at least one sheet.
+    requests += [
+        {"deleteSheet": {"sheetId": sid}}
+        for title, sid in existing.items()
+        if title in drop_titles
+    ]
+    sheets_api.batchUpdate(
+        spreadsheetId=spreadsheet_id, body={"requests": requests}
+    ).execute(num_retries=API_RETRIES)
+
+
+def _text_cell(value: str) -> dict:
+    """CellData holding value verbatim, even if it looks like a formula."""
+    if not value:
+        return {}
+    return {"userEnteredValue": {"stringValue": value}}
+
+
+def _formula_cell(formula: str) -> dict:
+    """CellData for a formula built by this module (e.g. _hyperlink)."""
+    return {"userEnteredValue": {"formulaValue": formula}}
+
+
 def _extract_date_and_title(file_name: str) -> tuple[str, str]:
-    match = re.match(r"^(\d{4}-\d{2}-\d{2})(.*)", file_name)
+    match = _DATE_TITLE_RE.match(file_name)
     if not match:
         return ("", file_name)
     date = match[1]
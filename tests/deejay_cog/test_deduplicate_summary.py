@@ -12,17 +12,37 @@ def _make_g_for_sheet(data):
                 "sheets": [{"properties": {"sheetId": 1, "title": "Summary"}}]
             }
         ),
-        read_values=MagicMock(return_value=data),
-        clear=MagicMock(),
-        write_values=MagicMock(),
+        service=MagicMock(),
         formatter=SimpleNamespace(apply_formatting_to_sheet=MagicMock()),
     )
+    _batch_get_for(sheets_api.service).return_value.execute.return_value = {
+        "valueRanges": [{"range": "'Summary'!A1:Z4", "values": data}]
+    }
     g = SimpleNamespace(
         sheets=sheets_api,
     )
     return g
 
 
+def _batch_get_for(service):
+    return service.spreadsheets.return_value.values.return_value.batchGet
+
+
+def _batch_update(g):
+    return g.sheets.service.spreadsheets.return_value.values.return_value.batchUpdate
+
+
+def _written_values(g):
+    """Return the values written for the single tab in the batchUpdate call."""
+    _batch_update(g).assert_called_once()
+    _batch_update(g).return_value.execute.assert_called_once_with(num_retries=5)
+    body = _batch_update(g).call_args.kwargs["body"]
+    assert body["valueInputOption"] == "RAW"
+    (entry,) = body["data"]
+    assert entry["range"] == "'Summary'!A1"
+    return entry["values"]
+
+
 def test_deduplicate_summary_merges_duplicates_and_sums_count():
     header = ["Title", "Artist"]
     row1 = ["Song A", "Artist 1"]
@@ -40,20 +60,22 @@ def test_deduplicate_summary_merges_duplicates_and_sums_count():
         dedup_mod.deduplicate_summary("spreadsheet-id")
 
     g.sheets.get_metadata.assert_called_once()
-    g.sheets.read_values.assert_called_once()
-    g.sheets.clear.assert_called_once()
-    g.sheets.write_values.assert_called_once()
-    args, kwargs = g.sheets.write_values.call_args
-    _, _, final_data, *_ = args
+    _batch_get_for(g.sheets.service).assert_called_once()
+    assert _batch_get_for(g.sheets.service).call_args.kwargs["ranges"] == [
+        "'Summary'!A:Z"
+    ]
+    final_data = _written_values(g)
 
     out_header = final_data[0]
     assert "Count" in out_header
     count_idx = out_header.index("Count")
-    out_rows = final_data[1:]
+    out_rows = final_data[1:3]
     titles = [r[0] for r in out_rows]
     assert titles == ["Song A", "Song B"]
     counts = [int(r[count_idx]) for r in out_rows]
     assert counts == [2, 1]
+    # The merged-away row is blanked instead of clearing the whole tab.
+    assert final_data[3:] == [["", "", ""]]
 
 
 def test_deduplicate_summary_is_idempotent_for_clean_sheet():
@@ -71,14 +93,32 @@ def test_deduplicate_summary_is_idempotent_for_clean_sheet():
         mock_google_api.from_env.return_value = g
         dedup_mod.deduplicate_summary("spreadsheet-id")
 
-    g.sheets.read_values.assert_called_once()
-    g.sheets.write_values.assert_called_once()
-    args, _ = g.sheets.write_values.call_args
-    _, _, final_data, *_ = args
+    _batch_get_for(g.sheets.service).assert_called_once()
+    final_data = _written_values(g)
     assert final_data[0] == header
     assert final_data[1:] == [row1, row2]
 
 
+def test_deduplicate_summary_adds_count_after_short_and_long_rows():
+    header = ["Title", "Artist"]
+    short_row = ["Song A"]
+    long_row = ["Song B", "Artist 2", "stray"]
+    data = [header, short_row, long_row]
+
+    g = _make_g_for_sheet(data)
+
+    with (
+        patch.object(dedup_mod, "GoogleAPI") as mock_google_api,
+        patch.object(dedup_mod, "log"),
+    ):
+        mock_google_api.from_env.return_value = g
+        dedup_mod.deduplicate_summary("spreadsheet-id")
+
+    final_data = _written_values(g)
+    assert final_data[0] == ["Title", "Artist", "Count"]
+    assert final_data[1:] == [["Song A", "", "1"], ["Song B", "Artist 2", "1"]]
+
+
 def test_deduplicate_summary_handles_read_failure_without_raising():
     sheets_api = SimpleNamespace(
         get_metadata=MagicMock(
@@ -86,11 +126,12 @@ def test_deduplicate_summary_handles_read_failure_without_raising():
                 "sheets": [{"properties": {"sheetId": 1, "title": "Summary"}}]
             }
         ),
-        read_values=MagicMock(side_effect=RuntimeError("boom")),
-        clear=MagicMock(),
-        write_values=MagicMock(),
+        service=MagicMock(),
         formatter=SimpleNamespace(apply_formatting_to_sheet=MagicMock()),
     )
+    _batch_get_for(sheets_api.service).return_value.execute.side_effect = RuntimeError(
+        "boom"
+    )
     g = SimpleNamespace(sheets=sheets_api)
 
     with (
@@ -102,4 +143,20 @@ def test_deduplicate_summary_handles_read_failure_without_raising():
             dedup_mod.deduplicate_summary("spreadsheet-id")
 
     g.sheets.get_metadata.assert_called_once()
-    g.sheets.read_values.assert_called_once()
+    _batch_get_for(g.sheets.service).assert_called_once()
+    _batch_update(g).assert_not_called()
+
+
+def test_normalize_bpm_treats_numeric_equivalents_as_equal():
+    assert dedup_mod._normalize_bpm("100") == "100"
+    assert dedup_mod._normalize_bpm("100.0") == "100"
+    assert dedup_mod._normalize_bpm("100.50") == "100.5"
+    assert dedup_mod._normalize_bpm(" fast ") == "fast"
+    assert dedup_mod._normalize_bpm("") == ""
+
+
+def test_normalize_bpm_matches_near_whole_and_six_decimal_values():
+    assert dedup_mod._normalize_bpm("128.0000000001") == "128"
+    assert dedup_mod._normalize_bpm("128.0000001") == "128"
+    assert dedup_mod._normalize_bpm("100.1234561") == "100.123456"
+    assert dedup_mod._normalize_bpm("nan") == "nan"
@@ -1,6 +1,11 @@
+import json
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+from googleapiclient.http import HttpMockSequence, HttpRequest
+from googleapiclient.model import JsonModel
+
 import deejay_cog.generate_summaries as generate_summaries
 
 
@@ -8,36 +13,48 @@ def _make_file(name: str, fid: str):
     return SimpleNamespace(name=name, id=fid)
 
 
-def test_generate_summary_filters_columns_and_orders_by_desired_order():
+def _make_summary_g():
     g = SimpleNamespace()
     sheets = SimpleNamespace(
         get_metadata=MagicMock(
             return_value={"sheets": [{"properties": {"sheetId": 1, "title": "Sheet1"}}]}
         ),
-        read_values=MagicMock(
-            return_value=[
-                ["Title", "Artist", "Ignored", "Genre"],
-                [" A ", " X ", "foo", " House "],
-                [" B ", " Y ", "bar", " Techno "],
-            ]
-        ),
+        service=MagicMock(),
         ensure_sheet_exists=MagicMock(),
         clear_all_except_one_sheet=MagicMock(),
         insert_rows=MagicMock(),
         formatter=SimpleNamespace(apply_formatting_to_sheet=MagicMock()),
     )
+    batch_get = sheets.service.spreadsheets.return_value.values.return_value.batchGet
+    batch_get.return_value.execute.return_value = {
+        "valueRanges": [
+            {
+                "values": [
+                    ["Title", "Artist", "Ignored", "Genre"],
+                    [" A ", " X ", "foo", " House "],
+                    [" B ", " Y ", "bar", " Techno "],
+                ]
+            }
+        ]
+    }
     g.sheets = sheets
     g.drive = SimpleNamespace(
         create_spreadsheet_in_folder=MagicMock(return_value="ss-id"),
-        copy_file=MagicMock(return_value="year-summary-id"),
+        copy_file=MagicMock(),
     )
+    return g
 
+
+def test_generate_summary_filters_columns_and_orders_by_desired_order():
+    g = _make_summary_g()
+    sheets = g.sheets
+    batch_get = sheets.service.spreadsheets.return_value.values.return_value.batchGet
     files = [_make_file("2024-01-01_Set", "file-1")]
 
     with (
         patch.object(generate_summaries, "config") as mock_config,
         patch.object(generate_summaries, "log"),
-        patch.object(generate_summaries, "deduplication"),
+        patch.object(generate_summaries, "deduplication") as mock_dedup,
     ):
         mock_config.ALLOWED_HEADERS = ["title", "artist", "genre"]
         mock_config.desiredOrder = ["Title", "Genre", "Artist"]
@@ -47,7 +64,8 @@ def test_generate_summary_filters_columns_and_orders_by_desired_order():
         )
 
     sheets.get_metadata.assert_called_once()
-    sheets.read_values.assert_called_once()
+    batch_get.assert_called_once()
+    assert batch_get.call_args.kwargs["ranges"] == ["'Sheet1'!A:Z"]
     sheets.insert_rows.assert_called_once()
     args, kwargs = sheets.insert_rows.call_args
     _, sheet_name, rows, *_ = args
@@ -58,6 +76,12 @@ def test_generate_summary_filters_columns_and_orders_by_desired_order():
     data_rows = rows[1:]
     assert [r[0] for r in data_rows] == ["A", "B"]
 
+    g.drive.create_spreadsheet_in_folder.assert_called_once_with(
+        "2024 Summary", "summary-folder"
+    )
+    g.drive.copy_file.assert_not_called()
+    mock_dedup.deduplicate_summary.assert_called_once_with("ss-id", g=g)
+
 
 def test_generate_next_missing_summary_skips_existing_canonical_and_unready_years():
     summary_folder = SimpleNamespace(id="summary-folder")
@@ -105,6 +129,60 @@ def test_generate_next_missing_summary_skips_existing_canonical_and_unready_year
         generate_summaries.generate_summaries_flow.fn()
 
     g.drive.ensure_folder.assert_called_once()
+    summary_listings = [
+        c for c in g.drive.list_files.call_args_list if c.args[0] == "summary-folder"
+    ]
+    assert len(summary_listings) == 1
     assert mock_dedup.deduplicate_summary.call_count == 1
     mock_dedup.deduplicate_summary.assert_called_with("sum-2023", g=g)
     mock_generate_folder.assert_not_called()
+
+
+def test_generate_summary_deletes_partial_summary_when_write_fails():
+    g = _make_summary_g()
+    g.sheets.insert_rows.side_effect = RuntimeError("quota")
+    g.drive.delete_file = MagicMock()
+    files = [_make_file("2024-01-01_Set", "file-1")]
+
+    with (
+        patch.object(generate_summaries, "config") as mock_config,
+        patch.object(generate_summaries, "log"),
+        patch.object(generate_summaries, "deduplication") as mock_dedup,
+        pytest.raises(RuntimeError, match="quota"),
+    ):
+        mock_config.ALLOWED_HEADERS = ["title", "artist", "genre"]
+        mock_config.desiredOrder = ["Title", "Genre", "Artist"]
+
+        generate_summaries.generate_summary_for_folder(
+            g, files, summary_folder_id="summary-folder", year="2024"
+        )
+
+    g.drive.delete_file.assert_called_once_with("ss-id")
+    mock_dedup.deduplicate_summary.assert_not_called()
+
+
+def test_read_summary_sheets_retries_throttled_batch_get():
+    values = [["Title", "Artist"], ["A", "X"]]
+    http = HttpMockSequence(
+        [
+            ({"status": "429"}, '{"error": {"code": 429}}'),
+            ({"status": "200"}, json.dumps({"valueRanges": [{"values": values}]})),
+        ]
+    )
+    request = HttpRequest(
+        http,
+        JsonModel().response,
+        "https://sheets.googleapis.com/v4/spreadsheets/src/values:batchGet",
+    )
+    sleeps: list[float] = []
+    request._sleep = sleeps.append
+    g = _make_summary_g()
+    values_api = g.sheets.service.spreadsheets.return_value.values.return_value
+    values_api.batchGet.return_value = request
+
+    tabs = generate_summaries._read_summary_sheets(
+        g, _make_file("2024-01-01_set", "src"), frozenset({"title", "artist"})
+    )
+
+    assert tabs == [(["title", "artist"], [0, 1], [["A", "X"]])]
+    assert len(sleeps) == 1  # one backoff, then the retried read succeeded
@@ -0,0 +1,22 @@
+import threading
+from unittest.mock import MagicMock
+
+from deejay_cog._google_clients import ClientPool
+
+
+def test_client_pool_builds_one_client_per_worker_and_keeps_order():
+    factory = MagicMock(side_effect=lambda: object())
+    seen: dict[int, set[int]] = {}
+
+    def work(client, item):
+        seen.setdefault(threading.get_ident(), set()).add(id(client))
+        return item * 2
+
+    with ClientPool(factory, max_workers=2) as pool:
+        first = list(pool.map(work, [1, 2, 3]))
+        second = list(pool.map(work, [4, 5]))
+
+    assert first == [2, 4, 6]
+    assert second == [8, 10]
+    assert all(len(ids) == 1 for ids in seen.values())
+    assert factory.call_count == len(seen) <= 2
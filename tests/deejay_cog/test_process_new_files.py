@@ -3,6 +3,7 @@ import sys
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
 from prefect.testing.utilities import prefect_test_harness
 
 import deejay_cog.process_new_files as process_new_files
@@ -18,7 +19,7 @@ def test_main_posts_single_success_finding_when_llm_and_api_configured(
     drive = SimpleNamespace(list_files=MagicMock(return_value=[fake_file]))
     g = SimpleNamespace(drive=drive)
 
-    def _fake_process_csv(g_api, meta, year, stats):
+    def _fake_process_csv(g_api, meta, year, stats, cache=None):
         stats.sets_imported += 1
         stats.total_tracks += 11
         return "imported"
@@ -77,7 +78,7 @@ def test_main_posts_single_warn_finding_when_sets_failed(monkeypatch) -> None:
     drive = SimpleNamespace(list_files=MagicMock(return_value=[fake_file]))
     g = SimpleNamespace(drive=drive)
 
-    def _fake_process_csv(g_api, meta, year, stats):
+    def _fake_process_csv(g_api, meta, year, stats, cache=None):
         stats.sets_imported += 1
         stats.sets_failed += 1
         return "imported"
@@ -148,6 +149,126 @@ def test_normalize_csv_handles_all_rules_together(tmp_path):
     assert normalized == "a, b\n1, 2"
 
 
+# --- Prefix normalization tests ----------------------------------------------
+
+
+def test_normalize_prefixes_in_source_batches_renames_and_skips_taken_names():
+    files = [
+        SimpleNamespace(id="f1", name="FAILED_2024-01-01_A.csv"),
+        SimpleNamespace(id="f2", name="copy of 2024-01-02_B.csv"),
+        SimpleNamespace(id="f3", name="possible_duplicate_2024-01-03_C.csv"),
+        SimpleNamespace(id="f4", name="2024-01-03_C.csv"),
+        SimpleNamespace(id="f5", name="2024-01-04_D.csv"),
+    ]
+    service = MagicMock()
+    drive = SimpleNamespace(list_files=MagicMock(return_value=files), service=service)
+
+    with (
+        patch.object(process_new_files, "config") as mock_cfg,
+        patch.object(process_new_files, "log"),
+    ):
+        mock_cfg.CSV_SOURCE_FOLDER_ID = "src-folder"
+        process_new_files.normalize_prefixes_in_source(drive)
+
+    drive.list_files.assert_called_once()
+    service.new_batch_http_request.assert_called_once()
+    batch = service.new_batch_http_request.return_value
+    assert batch.add.call_count == 2
+    updates = [c.kwargs for c in service.files.return_value.update.call_args_list]
+    assert [(u["fileId"], u["body"]["name"]) for u in updates] == [
+        ("f1", "2024-01-01_A.csv"),
+        ("f2", "2024-01-02_B.csv"),
+    ]
+    batch.execute.assert_called_once()
+
+
+def test_normalize_prefixes_in_source_frees_target_when_rename_fails():
+    files = [
+        SimpleNamespace(id="f1", name="FAILED_2024-01-01_A.csv"),
+        SimpleNamespace(id="f2", name="possible_duplicate_2024-01-01_A.csv"),
+    ]
+    service = MagicMock()
+    drive = SimpleNamespace(list_files=MagicMock(return_value=files), service=service)
+    callbacks = []
+
+    def _new_batch(callback):
+        callbacks.append(callback)
+        batch = MagicMock()
+        if len(callbacks) == 1:
+            batch.execute.side_effect = lambda: callback("0", None, RuntimeError("403"))
+        return batch
+
+    service.new_batch_http_request.side_effect = _new_batch
+
+    with (
+        patch.object(process_new_files, "config") as mock_cfg,
+        patch.object(process_new_files, "log"),
+    ):
+        mock_cfg.CSV_SOURCE_FOLDER_ID = "src-folder"
+        process_new_files.normalize_prefixes_in_source(drive)
+
+    # f1's rename failed, so f2 gets the name in a second batch.
+    updates = [c.kwargs for c in service.files.return_value.update.call_args_list]
+    assert [(u["fileId"], u["body"]["name"]) for u in updates] == [
+        ("f1", "2024-01-01_A.csv"),
+        ("f2", "2024-01-01_A.csv"),
+    ]
+    assert len(callbacks) == 2
+
+
+def test_normalize_prefixes_in_source_skips_clean_folder():
+    files = [SimpleNamespace(id="f1", name="2024-01-01_A.csv")]
+    service = MagicMock()
+    drive = SimpleNamespace(list_files=MagicMock(return_value=files), service=service)
+
+    with patch.object(process_new_files, "config") as mock_cfg:
+        mock_cfg.CSV_SOURCE_FOLDER_ID = "src-folder"
+        process_new_files.normalize_prefixes_in_source(drive)
+
+    service.new_batch_http_request.assert_not_called()
+
+
+def test_remove_summary_file_for_year_lists_summary_folder_once_per_run():
+    drive = SimpleNamespace(
+        ensure_folder=MagicMock(return_value="summary-folder"),
+        list_files=MagicMock(
+            return_value=[
+                SimpleNamespace(id="s-2024", name="2024 Summary"),
+                SimpleNamespace(id="s-2023", name="2023 Summary"),
+            ]
+        ),
+        delete_file=MagicMock(),
+    )
+    g = SimpleNamespace(drive=drive)
+    cache = process_new_files.DriveRunCache()
+
+    for year in ("2024", "2024", "2022"):
+        process_new_files.remove_summary_file_for_year(g, year, cache)
+
+    drive.ensure_folder.assert_called_once()
+    drive.list_files.assert_called_once()
+    drive.delete_file.assert_called_once_with("s-2024")
+
+
+def test_remove_summary_file_for_year_retries_failed_delete_later_in_run():
+    drive = SimpleNamespace(
+        ensure_folder=MagicMock(return_value="summary-folder"),
+        list_files=MagicMock(
+            return_value=[SimpleNamespace(id="s-2024", name="2024 Summary")]
+        ),
+        delete_file=MagicMock(side_effect=[RuntimeError("drive 500"), None]),
+    )
+    g = SimpleNamespace(drive=drive)
+    cache = process_new_files.DriveRunCache()
+
+    with patch.object(process_new_files, "log"):
+        for _ in range(3):
+            process_new_files.remove_summary_file_for_year(g, "2024", cache)
+
+    assert drive.delete_file.call_count == 2
+    assert cache.summary_ids["2024 Summary"] == []
+
+
 # --- Deduplication tests -----------------------------------------------------
 
 
@@ -438,6 +559,54 @@ def test_rename_file_as_duplicate_calls_drive_rename():
     )
 
 
+@pytest.fixture
+def retry_sleeps(monkeypatch):
+    """Record Drive retry backoffs instead of sleeping (base delay pinned to 1s)."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(process_new_files, "_DRIVE_RETRY_BASE_DELAY", 1.0)
+    monkeypatch.setattr(process_new_files.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_rename_file_as_duplicate_retries_failed_rename(retry_sleeps):
+    mock_drive = SimpleNamespace(
+        rename_file=MagicMock(side_effect=[RuntimeError("503"), None]),
+        service=MagicMock(),
+    )
+    mock_drive.service.files().get().execute.return_value = {"name": "old.csv"}
+    g = SimpleNamespace(drive=mock_drive)
+
+    process_new_files.rename_file_as_duplicate(g, "file-id", "2024-01-01_Set.csv")
+
+    assert mock_drive.rename_file.call_count == 2
+    assert retry_sleeps == [1.0]
+
+
+def test_rename_file_as_duplicate_stops_when_failed_rename_landed(retry_sleeps):
+    new_name = "possible_duplicate_2024-01-01_Set.csv"
+    mock_drive = SimpleNamespace(
+        rename_file=MagicMock(side_effect=RuntimeError("timeout")),
+        service=MagicMock(),
+    )
+    mock_drive.service.files().get().execute.return_value = {"name": new_name}
+    g = SimpleNamespace(drive=mock_drive)
+
+    process_new_files.rename_file_as_duplicate(g, "file-id", "2024-01-01_Set.csv")
+
+    mock_drive.rename_file.assert_called_once_with("file-id", new_name)
+    assert retry_sleeps == []
+
+
+def test_retry_drive_mutation_backs_off_then_reraises(retry_sleeps):
+    mutate = MagicMock(side_effect=RuntimeError("503"))
+
+    with pytest.raises(RuntimeError):
+        process_new_files._retry_drive_mutation(mutate, lambda: False, "Rename")
+
+    assert mutate.call_count == 3
+    assert retry_sleeps == [1.0, 2.0]
+
+
 def test_process_csv_file_skips_when_duplicate_exists_in_year_folder():
     """TEST-002: end-to-end dedup — a CSV whose base name already exists
     in the year folder is renamed with possible_duplicate_ prefix and
@@ -507,6 +676,33 @@ def test_process_non_csv_file_moves_to_year_folder():
     )
 
 
+def test_process_non_csv_file_reuses_cached_year_folder():
+    mock_drive = SimpleNamespace(
+        ensure_folder=MagicMock(return_value="year-folder-id"),
+        move_file=MagicMock(),
+        rename_file=MagicMock(),
+        list_files=MagicMock(return_value=[]),
+    )
+    g = SimpleNamespace(drive=mock_drive)
+    cache = process_new_files.DriveRunCache()
+
+    with (
+        patch.object(process_new_files, "remove_summary_file_for_year"),
+        patch.object(process_new_files, "config") as mock_cfg,
+    ):
+        mock_cfg.DJ_SETS_FOLDER_ID = "dj-sets-folder"
+        for file_id in ("file-1", "file-2"):
+            file_meta = {"id": file_id, "name": "2024-01-15_flyer.pdf"}
+            process_new_files.process_non_csv_file(g, file_meta, "2024", cache=cache)
+
+    mock_drive.ensure_folder.assert_called_once_with("dj-sets-folder", "2024")
+    mock_drive.list_files.assert_called_once()
+    mock_drive.move_file.assert_called_once()
+    mock_drive.rename_file.assert_called_once_with(
+        "file-2", "possible_duplicate_2024-01-15_flyer.pdf"
+    )
+
+
 # ── Failure path (TEST-003) ───────────────────────────────────────────────────
 
 
@@ -523,7 +719,7 @@ def test_main_flow_continues_after_single_file_failure(monkeypatch) -> None:
 
     call_count = 0
 
-    def _fake_process_csv(g_api, meta, year, stats):
+    def _fake_process_csv(g_api, meta, year, stats, cache=None):
         nonlocal call_count
         call_count += 1
         if meta["id"] == "f-1":
@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+from deejay_cog._sheets import batch_get_values, sheet_range
+
+
+def test_sheet_range_quotes_title_and_escapes_apostrophes():
+    assert sheet_range("Summary", "A:Z") == "'Summary'!A:Z"
+    assert sheet_range("DJ's Set 1", "A1") == "'DJ''s Set 1'!A1"
+
+
+def test_batch_get_values_reads_all_tabs_in_one_call():
+    values_api = MagicMock()
+    values_api.batchGet.return_value.execute.return_value = {
+        "valueRanges": [
+            {"range": "'One'!A1:B2", "values": [["a", "b"], ["1", "2"]]},
+            {"range": "'Two'!A1:Z1000"},
+        ]
+    }
+
+    result = batch_get_values(values_api, "ss-id", ["One", "Two"])
+
+    values_api.batchGet.assert_called_once_with(
+        spreadsheetId="ss-id",
+        ranges=["'One'!A:Z", "'Two'!A:Z"],
+        majorDimension="ROWS",
+    )
+    values_api.batchGet.return_value.execute.assert_called_once_with(num_retries=5)
+    assert result == [[["a", "b"], ["1", "2"]], []]
+
+
+def test_batch_get_values_skips_request_without_tabs():
+    values_api = MagicMock()
+
+    assert batch_get_values(values_api, "ss-id", []) == []
+    values_api.batchGet.assert_not_called()
@@ -1,8 +1,18 @@
 import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+import pytest
+
+import deejay_cog.update_deejay_set_collection as collection
 from deejay_cog.update_deejay_set_collection import (
     _create_collection_snapshot,
     _extract_date_and_title,
+    _formula_cell,
+    _hyperlink,
+    _list_folder_files,
+    _text_cell,
+    _write_collection_tabs,
     _write_json_snapshot,
 )
 
@@ -47,6 +57,21 @@ def test_create_collection_snapshot_uses_given_key():
     assert result["items"] == []
 
 
+# -- _hyperlink ----------------------------------------------------------------
+
+
+def test_hyperlink_builds_formula():
+    assert _hyperlink("https://x/1", "2024-01-01 Set") == (
+        '=HYPERLINK("https://x/1", "2024-01-01 Set")'
+    )
+
+
+def test_hyperlink_doubles_quotes_in_label():
+    assert _hyperlink("https://x/1", 'The "Big" Night') == (
+        '=HYPERLINK("https://x/1", "The ""Big"" Night")'
+    )
+
+
 # -- _write_json_snapshot ------------------------------------------------------
 
 
@@ -72,3 +97,115 @@ def test_write_json_snapshot_writes_formatted_json(tmp_path):
     _write_json_snapshot(data, str(out))
     content = out.read_text(encoding="utf-8")
     assert "\n" in content  # formatted, not single-line
+
+
+def test_write_json_snapshot_keeps_previous_file_when_encoding_fails(tmp_path):
+    out = tmp_path / "snap.json"
+    out.write_text('{"folders": []}', encoding="utf-8")
+
+    with pytest.raises(TypeError):
+        _write_json_snapshot({"folders": [object()]}, str(out))
+
+    assert json.loads(out.read_text(encoding="utf-8")) == {"folders": []}
+    assert list(tmp_path.iterdir()) == [out]
+
+
+def test_write_json_snapshot_keeps_non_ascii_names_readable(tmp_path):
+    data = {"folders": [{"name": "Café Señor"}]}
+    out = tmp_path / "snap.json"
+    _write_json_snapshot(data, str(out))
+    assert "Café Señor" in out.read_text(encoding="utf-8")
+
+
+# -- _write_collection_tabs ----------------------------------------------------
+
+
+def test_write_collection_tabs_batches_all_tabs():
+    service = MagicMock()
+    sheets = SimpleNamespace(
+        service=service,
+        get_metadata=MagicMock(
+            return_value={"sheets": [{"properties": {"sheetId": 7, "title": "T"}}]}
+        ),
+    )
+    g = SimpleNamespace(sheets=sheets)
+    link = _formula_cell("=HYPERLINK()")
+    tab_values = [
+        ("2024", [[_text_cell("Date")], [_text_cell("2024-01-01"), {}, link]]),
+        ("Summary_Tab", [[_text_cell("Link")], [link]]),
+    ]
+
+    _write_collection_tabs(
+        g, "ss-id", tab_values, text_tabs={"2024"}, drop_titles={"T", "Sheet1"}
+    )
+
+    spreadsheets = service.spreadsheets.return_value
+    spreadsheets.batchUpdate.assert_called_once()
+    spreadsheets.values.return_value.batchUpdate.assert_not_called()
+    spreadsheets.batchUpdate.return_value.execute.assert_called_once_with(num_retries=5)
+    requests = spreadsheets.batchUpdate.call_args.kwargs["body"]["requests"]
+    assert [r["addSheet"]["properties"] for r in requests[:2]] == [
+        {"sheetId": 8, "title": "2024", "index": 0},
+        {"sheetId": 9, "title": "Summary_Tab", "index": 1},
+    ]
+    assert requests[2]["repeatCell"]["range"]["sheetId"] == 8
+    update = requests[3]["updateCells"]
+    assert update["start"]["sheetId"] == 8
+    assert update["rows"][1]["values"] == [
+        {"userEnteredValue": {"stringValue": "2024-01-01"}},
+        {},
+        {"userEnteredValue": {"formulaValue": "=HYPERLINK()"}},
+    ]
+    assert requests[4]["updateCells"]["start"]["sheetId"] == 9
+    assert requests[5:] == [{"deleteSheet": {"sheetId": 7}}]
+
+
+# -- generate_dj_set_collection ------------------------------------------------
+
+
+def test_generate_dj_set_collection_never_sends_set_names_as_formulas(
+    monkeypatch, tmp_path
+):
+    spreadsheet = "application/vnd.google-apps.spreadsheet"
+    g = MagicMock()
+    g.drive.get_all_subfolders.return_value = [SimpleNamespace(id="y", name="2024")]
+    g.drive.get_files_in_folder.return_value = [
+        SimpleNamespace(id="1", name="2024-05-01 =Remix", mime_type=spreadsheet),
+        SimpleNamespace(id="2", name="=Intro", mime_type=spreadsheet),
+    ]
+    g.sheets.get_metadata.return_value = {"sheets": []}
+    monkeypatch.setattr(collection.GoogleAPI, "from_env", lambda: g)
+    monkeypatch.setattr(collection, "post_run_finding", MagicMock())
+    monkeypatch.setattr(
+        collection.config,
+        "DEEJAY_SET_COLLECTION_JSON_PATH",
+        str(tmp_path / "snap.json"),
+        raising=False,
+    )
+
+    collection.generate_dj_set_collection.fn()
+
+    spreadsheets = g.sheets.service.spreadsheets.return_value
+    requests = spreadsheets.batchUpdate.call_args.kwargs["body"]["requests"]
+    rows = next(r["updateCells"]["rows"] for r in requests if "updateCells" in r)
+    assert [
+        [cell.get("userEnteredValue") for cell in row["values"][:2]] for row in rows[1:]
+    ] == [
+        [{"stringValue": "2024-05-01"}, {"stringValue": "=Remix"}],
+        [None, {"stringValue": "=Intro"}],
+    ]
+    assert all(
+        "formulaValue" in row["values"][2]["userEnteredValue"] for row in rows[1:]
+    )
+
+
+# -- _list_folder_files --------------------------------------------------------
+
+
+def test_list_folder_files_lists_files_only():
+    drive = SimpleNamespace(get_files_in_folder=MagicMock(return_value=["f"]))
+
+    assert _list_folder_files(SimpleNamespace(drive=drive), "folder-id") == ["f"]
+    drive.get_files_in_folder.assert_called_once_with(
+        "folder-id", include_folders=False
+    )